@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["pyyaml"]
+# dependencies = ["pyyaml", "orjson", "watchfiles>=0.21"]
 # ///
 """
 Claude Code Hook Runner - Unified entrypoint for all hook events.
@@ -10,85 +10,151 @@ This script reads JSON from stdin, auto-detects the hook event type,
 loads configuration, and routes to the appropriate handler.
 """
 
-import json
+import io
+import os
 import sys
-from pathlib import Path
 
 # Add lib to path for imports
-lib_path = Path(__file__).parent / "lib"
-sys.path.insert(0, str(lib_path.parent))
+sys.path.insert(0, os.path.dirname(__file__))
 
+from lib import handlers
 from lib.config import load_config
-from lib.handlers import (
-    AskUserQuestionHandler,
-    NotificationHandler,
-    PermissionRequestHandler,
-    PostToolUseFailureHandler,
-    PreCompactHandler,
-    StopHandler,
-    SubagentStartHandler,
-    SubagentStopHandler,
-    TaskCompletedHandler,
-    TeammateIdleHandler,
-    UserPromptSubmitHandler,
-)
+from lib.hook_input import parse_hook_json
+
+# Hook event name -> Config attribute holding that hook's settings
+HOOK_EVENT_TO_CONFIG_ATTR = {
+    "Stop": "stop",
+    "PostToolUse": "ask_user_question",
+    "PermissionRequest": "permission_request",
+    "PostToolUseFailure": "post_tool_use_failure",
+    "Notification": "notification",
+    "SubagentStart": "subagent_start",
+    "SubagentStop": "subagent_stop",
+    "TeammateIdle": "teammate_idle",
+    "TaskCompleted": "task_completed",
+    "UserPromptSubmit": "user_prompt_submit",
+    "PreCompact": "pre_compact",
+}
+
+# Hook event name -> handler class name in lib.handlers (resolved lazily).
+# PostToolUse is only dispatched for the AskUserQuestion tool.
+HOOK_EVENT_TO_HANDLER = {
+    "Stop": "StopHandler",
+    "PostToolUse": "AskUserQuestionHandler",
+    "PermissionRequest": "PermissionRequestHandler",
+    "PostToolUseFailure": "PostToolUseFailureHandler",
+    "Notification": "NotificationHandler",
+    "SubagentStart": "SubagentStartHandler",
+    "SubagentStop": "SubagentStopHandler",
+    "TeammateIdle": "TeammateIdleHandler",
+    "TaskCompleted": "TaskCompletedHandler",
+    "UserPromptSubmit": "UserPromptSubmitHandler",
+    "PreCompact": "PreCompactHandler",
+}
+
+
+def _detach():
+    """Double-fork so Claude Code stops waiting on this hook.
+
+    The original process exits immediately; the grandchild is re-parented
+    to init, detached from the session, and carries on with the real work.
+    Set ``HOOK_FOREGROUND=1`` (or run where ``fork`` is unavailable) to
+    keep everything in the calling process.
+    """
+    if not hasattr(os, "fork") or os.environ.get("HOOK_FOREGROUND") == "1":
+        return
+
+    try:
+        if os.fork() > 0:
+            os._exit(0)
+        os.setsid()
+        if os.fork() > 0:
+            os._exit(0)
+    except OSError:
+        return
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    if devnull > 2:
+        os.close(devnull)
+
+
+def _event_from_argv(argv: list[str]) -> str | None:
+    """Get the hook event name passed as ``--event NAME`` or ``--event=NAME``.
+
+    Args:
+        argv: Command-line arguments (without the program name)
+
+    Returns:
+        The event name, or None if the flag is absent
+    """
+    for i, arg in enumerate(argv):
+        if arg == "--event" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--event="):
+            return arg.split("=", 1)[1]
+    return None
 
 
 def main():
     """Main entry point for hook processing."""
+    # With --event the event is known up front, so the JSON body is only
+    # parsed (by the handler) once an enabled handler has been selected
+    event_override = _event_from_argv(sys.argv[1:])
+
     # Read raw stdin
-    try:
-        raw_input = sys.stdin.read()
-        data = json.loads(raw_input) if raw_input else {}
-    except json.JSONDecodeError:
-        data = {}
+    raw_input = sys.stdin.buffer.read()
+    data: dict | None = None
+    if event_override is None:
+        data = parse_hook_json(raw_input)
+
+    # Hand the rest off to a background process
+    _detach()
 
     # Load configuration
-    config_path = Path(__file__).parent / "config.yaml"
+    config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
     config = load_config(config_path)
 
     # Detect hook event type
-    hook_event = data.get("hook_event_name", "")
+    if event_override is not None:
+        hook_event = event_override
+    else:
+        hook_event = data.get("hook_event_name", "")
+
+    # Skip disabled hooks before importing their handler module
+    config_attr = HOOK_EVENT_TO_CONFIG_ATTR.get(hook_event)
+    if config_attr is None or not getattr(config, config_attr).enabled:
+        return
 
     # Route to appropriate handler
     handler = None
-
-    if hook_event == "Stop":
-        handler = StopHandler(config)
-    elif hook_event == "PostToolUse":
-        # Check if this is an AskUserQuestion tool
-        tool_name = data.get("tool_name", "")
-        if tool_name == "AskUserQuestion":
-            handler = AskUserQuestionHandler(config)
-    elif hook_event == "PermissionRequest":
-        handler = PermissionRequestHandler(config)
-    elif hook_event == "PostToolUseFailure":
-        handler = PostToolUseFailureHandler(config)
-    elif hook_event == "Notification":
-        handler = NotificationHandler(config)
-    elif hook_event == "SubagentStart":
-        handler = SubagentStartHandler(config)
-    elif hook_event == "SubagentStop":
-        handler = SubagentStopHandler(config)
-    elif hook_event == "TeammateIdle":
-        handler = TeammateIdleHandler(config)
-    elif hook_event == "TaskCompleted":
-        handler = TaskCompletedHandler(config)
-    elif hook_event == "UserPromptSubmit":
-        handler = UserPromptSubmitHandler(config)
-    elif hook_event == "PreCompact":
-        handler = PreCompactHandler(config)
+    handler_name = HOOK_EVENT_TO_HANDLER.get(hook_event)
+    # (with an unparsed body, AskUserQuestionHandler.should_handle checks the tool)
+    if (
+        hook_event == "PostToolUse"
+        and data is not None
+        and data.get("tool_name", "") != "AskUserQuestion"
+    ):
+        handler_name = None
+    if handler_name:
+        handler = getattr(handlers, handler_name)(config)
 
     # Handle the event
     if handler:
         try:
-            handler.handle(data)
+            if data is None:
+                handler.handle_stream(io.BytesIO(raw_input))
+            else:
+                handler.handle(data)
         except Exception as e:
             # Log error but don't crash the hook
             if config.global_config.debug:
-                debug_dir = Path(config.global_config.project_dir) / config.global_config.debug_dir
-                debug_dir.mkdir(parents=True, exist_ok=True)
-                error_log = debug_dir / "hook_error.log"
+                debug_dir = os.path.join(
+                    config.global_config.project_dir, config.global_config.debug_dir
+                )
+                os.makedirs(debug_dir, exist_ok=True)
+                error_log = os.path.join(debug_dir, "hook_error.log")
                 with open(error_log, "w") as f:
                     f.write(f"Error in {handler.__class__.__name__}: {e}\n")
                     import traceback
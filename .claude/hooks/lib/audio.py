@@ -1,15 +1,14 @@
 """Audio functionality for Claude Code hooks - sound effects and speech (macOS)."""
 
 import os
+import shlex
 import subprocess
-import threading
-import time
 from dataclasses import dataclass
 
 from .config import SoundConfig, VoiceConfig
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AudioSettings:
     """Settings for audio playback."""
 
@@ -21,33 +20,56 @@ class AudioSettings:
         """Create AudioSettings from SoundConfig and VoiceConfig."""
         return cls(sound=sound, voice=voice)
 
+    @property
+    def is_audible(self) -> bool:
+        """Whether play_notification() would play anything with these settings."""
+        return (self.sound.enabled and bool(self.sound.file)) or self.voice.enabled
 
-def play_sound(path: str, volume: float = 1.0, project_dir: str = "") -> bool:
-    """Play a sound effect file using macOS afplay command.
+
+def _resolve_sound_path(path: str, project_dir: str = "") -> str | None:
+    """Resolve a sound file path, returning None if the file does not exist.
 
     Args:
         path: Path to sound file (relative to project_dir or absolute)
-        volume: Volume level (0.0 to 1.0)
         project_dir: Project directory for relative paths
 
     Returns:
-        True if sound started playing, False otherwise
+        Full path to the sound file, or None if missing
     """
-    # Resolve path
     if not os.path.isabs(path) and project_dir:
         full_path = os.path.join(project_dir, path)
     else:
         full_path = path
 
-    if not os.path.exists(full_path):
-        return False
+    return full_path if os.path.exists(full_path) else None
+
 
+def _afplay_argv(path: str, volume: float) -> list[str]:
+    """Build the afplay command line for a sound file."""
     # Clamp volume between 0.0 and 1.0
     volume = max(0.0, min(1.0, volume))
+    return ["afplay", "-v", str(volume), path]
+
 
+def _say_argv(text: str, voice: str, rate: int, volume: float) -> list[str]:
+    """Build the say command line, with volume set via [[volm]]."""
+    # Clamp volume between 0.0 and 1.0
+    volume = max(0.0, min(1.0, volume))
+    return ["say", "-v", voice, "-r", str(rate), f"[[volm {volume:.2f}]] {text}"]
+
+
+def _spawn(argv: list[str]) -> bool:
+    """Start a detached background process, ignoring its output.
+
+    Args:
+        argv: Command line to run
+
+    Returns:
+        True if the process started, False otherwise
+    """
     try:
         subprocess.Popen(
-            ["afplay", "-v", str(volume), full_path],
+            argv,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
             start_new_session=True,
@@ -57,16 +79,35 @@ def play_sound(path: str, volume: float = 1.0, project_dir: str = "") -> bool:
         return False
 
 
+def play_sound(path: str, volume: float = 1.0, project_dir: str = "") -> bool:
+    """Play a sound effect file using macOS afplay command.
+
+    Args:
+        path: Path to sound file (relative to project_dir or absolute)
+        volume: Volume level (0.0 to 1.0)
+        project_dir: Project directory for relative paths
+
+    Returns:
+        True if sound started playing, False otherwise
+    """
+    full_path = _resolve_sound_path(path, project_dir)
+    if full_path is None:
+        return False
+
+    return _spawn(_afplay_argv(full_path, volume))
+
+
 def speak(
     text: str,
     voice: str = "Victoria",
     rate: int = 280,
     volume: float = 1.0,
 ) -> bool:
-    """Speak text using macOS say command with per-process volume control.
+    """Speak text using macOS say command with per-utterance volume control.
 
-    Renders speech to a temp file with `say -o`, then plays it with `afplay -v`
-    for volume control without touching the global system volume.
+    Plays straight to the audio device with a single `say` process. Volume is
+    set with the `[[volm …]]` embedded speech command, which only affects this
+    utterance and leaves the global system volume alone.
 
     Args:
         text: Text to speak
@@ -77,45 +118,53 @@ def speak(
     Returns:
         True if speech started, False otherwise
     """
-    import tempfile
+    return _spawn(_say_argv(text, voice, rate, volume))
 
-    with tempfile.NamedTemporaryFile(suffix=".aiff", delete=False) as tmp:
-        tmp_path = tmp.name
 
-    try:
-        result = subprocess.run(
-            ["say", "-v", voice, "-r", str(rate), "-o", tmp_path, text],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=10.0,
-        )
-        if result.returncode != 0:
-            os.unlink(tmp_path)
-            return False
+def speak_to_file(
+    text: str,
+    voice: str = "Victoria",
+    rate: int = 280,
+    volume: float = 1.0,
+) -> bool:
+    """Speak text by rendering to a file and playing it with afplay.
 
-        subprocess.Popen(
-            ["afplay", "-v", str(volume), tmp_path],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True,
-        )
+    Renders speech to a temp file with `say -o`, then plays it with `afplay -v`
+    for volume control without touching the global system volume. Slower than
+    speak(); use it when the volume must be enforced by the player rather than
+    by the voice. Rendering, playback and temp-file cleanup all run in one
+    detached `sh` process, so the caller never waits for `say` to finish.
 
-        def cleanup():
-            time.sleep(30)
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+    Args:
+        text: Text to speak
+        voice: macOS voice name
+        rate: Words per minute
+        volume: Voice volume (0.0 to 1.0)
 
-        threading.Thread(target=cleanup, daemon=True).start()
-        return True
-    except (OSError, subprocess.SubprocessError, subprocess.TimeoutExpired):
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
+    Returns:
+        True if the speech process started, False otherwise
+    """
+    import tempfile
+
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix=".aiff")
+        os.close(fd)
+    except OSError:
         return False
 
+    render = shlex.join(["say", "-v", voice, "-r", str(rate), "-o", tmp_path, text])
+    play = shlex.join(_afplay_argv(tmp_path, volume))
+    script = f"{render} && {play}; rm -f {shlex.quote(tmp_path)}"
+
+    if _spawn(["sh", "-c", script]):
+        return True
+
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+    return False
+
 
 def play_notification(
     message: str,
@@ -124,29 +173,39 @@ def play_notification(
 ) -> None:
     """Play a complete notification with optional sound and speech.
 
+    Sound and speech are chained in one detached `sh` process, so the delay
+    between them never keeps the hook process alive. Speech starts
+    `delay_ms` after the sound starts.
+
     Args:
         message: Text to speak
         settings: Audio settings with sound and voice configs
         project_dir: Project directory for relative paths
     """
-    sound_played = False
+    sound_cmd = None
+    speech_cmd = None
 
     # Play sound effect if enabled
     if settings.sound.enabled and settings.sound.file:
-        sound_played = play_sound(
-            settings.sound.file,
-            settings.sound.volume,
-            project_dir,
-        )
+        sound_path = _resolve_sound_path(settings.sound.file, project_dir)
+        if sound_path is not None:
+            sound_cmd = shlex.join(_afplay_argv(sound_path, settings.sound.volume))
 
     # Speak the message if enabled
     if settings.voice.enabled:
-        # Only delay if sound was played and we're about to speak
-        if sound_played:
-            time.sleep(settings.sound.delay_ms / 1000.0)
-        speak(
+        speech_cmd = shlex.join(_say_argv(
             message,
             settings.voice.name,
             settings.voice.rate,
             settings.voice.volume,
-        )
+        ))
+
+    if sound_cmd and speech_cmd:
+        # Only delay if sound was played and we're about to speak
+        delay = settings.sound.delay_ms / 1000.0
+        script = f"{sound_cmd} & sleep {delay:.3f}; {speech_cmd}"
+    else:
+        script = sound_cmd or speech_cmd
+
+    if script:
+        _spawn(["sh", "-c", script])
@@ -1,14 +1,16 @@
 """Configuration loading and validation for Claude Code hooks."""
 
+import importlib.util
 import os
-from dataclasses import dataclass, field
+import string
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, get_type_hints
 
-import yaml
 
-
-@dataclass
+@dataclass(slots=True)
 class SoundConfig:
     """Sound effect settings."""
 
@@ -18,7 +20,7 @@ class SoundConfig:
     delay_ms: int = 200
 
 
-@dataclass
+@dataclass(slots=True)
 class VoiceConfig:
     """Voice/speech settings."""
 
@@ -28,7 +30,7 @@ class VoiceConfig:
     rate: int = 280
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryConfig:
     """Summary extraction settings."""
 
@@ -38,7 +40,7 @@ class SummaryConfig:
     start: str = "action"  # "action" or "beginning"
 
 
-@dataclass
+@dataclass(slots=True)
 class HookConfig:
     """Base configuration for a hook."""
 
@@ -47,14 +49,68 @@ class HookConfig:
     voice: VoiceConfig = field(default_factory=VoiceConfig)
 
 
-@dataclass
+_CONVERTERS: dict[str | None, Callable[[Any], Any]] = {None: lambda v: v, "r": repr, "s": str, "a": ascii}
+
+
+@lru_cache(maxsize=None)
+def _compile_template(template: str) -> Callable[..., str]:
+    """Pre-parse a str.format template into a rendering function.
+
+    The template is split into literal text and named fields once, so
+    rendering only looks up and formats each field instead of re-parsing
+    the template on every call. Templates using anything beyond named
+    fields (positional or attribute/index fields, nested format specs)
+    fall back to ``template.format``.
+
+    Args:
+        template: Message template in str.format syntax
+
+    Returns:
+        Function taking the template fields as keyword arguments
+    """
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        return template.format
+
+    pieces: list[tuple[str, str | None, str, Callable[[Any], Any]]] = []
+    for literal, name, spec, conversion in parsed:
+        if name is not None and (not name.isidentifier() or "{" in (spec or "")):
+            return template.format
+        if conversion not in _CONVERTERS:
+            return template.format
+        pieces.append((literal, name, spec or "", _CONVERTERS[conversion]))
+
+    def render(**fields: Any) -> str:
+        out: list[str] = []
+        for literal, name, spec, convert in pieces:
+            out.append(literal)
+            if name is not None:
+                out.append(format(convert(fields[name]), spec))
+        return "".join(out)
+
+    return render
+
+
+@dataclass(slots=True)
+class TemplateHookConfig(HookConfig):
+    """Base configuration for hooks that speak a formatted message_template."""
+
+    message_template: str = ""
+    format_message: Callable[..., str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.format_message = _compile_template(self.message_template)
+
+
+@dataclass(slots=True)
 class StopHookConfig(HookConfig):
     """Configuration for Stop hook."""
 
     summary: SummaryConfig = field(default_factory=SummaryConfig)
 
 
-@dataclass
+@dataclass(slots=True)
 class AskUserQuestionHookConfig(HookConfig):
     """Configuration for AskUserQuestion hook."""
 
@@ -62,73 +118,80 @@ class AskUserQuestionHookConfig(HookConfig):
     default_message: str = "Claude has a question for you"
 
 
-@dataclass
-class PermissionRequestHookConfig(HookConfig):
+@dataclass(slots=True)
+class PermissionRequestHookConfig(TemplateHookConfig):
     """Configuration for PermissionRequest hook."""
 
     message_template: str = "Approve {tool_name}?"
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationHookConfig(HookConfig):
     """Configuration for Notification hook."""
 
     idle_message: str = "Claude is idle"
     auth_message: str = "Auth successful"
     default_message: str = "Notification"
+    messages_by_type: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.messages_by_type = {
+            "idle_prompt": self.idle_message,
+            "auth_success": self.auth_message,
+        }
 
 
-@dataclass
-class SubagentStartHookConfig(HookConfig):
+@dataclass(slots=True)
+class SubagentStartHookConfig(TemplateHookConfig):
     """Configuration for SubagentStart hook."""
 
     message_template: str = "Subagent {agent_type} started"
 
 
-@dataclass
-class SubagentStopHookConfig(HookConfig):
+@dataclass(slots=True)
+class SubagentStopHookConfig(TemplateHookConfig):
     """Configuration for SubagentStop hook."""
 
     message_template: str = "Subagent {agent_type} finished"
 
 
-@dataclass
-class TeammateIdleHookConfig(HookConfig):
+@dataclass(slots=True)
+class TeammateIdleHookConfig(TemplateHookConfig):
     """Configuration for TeammateIdle hook."""
 
     message_template: str = "{teammate_name} is idle"
 
 
-@dataclass
-class TaskCompletedHookConfig(HookConfig):
+@dataclass(slots=True)
+class TaskCompletedHookConfig(TemplateHookConfig):
     """Configuration for TaskCompleted hook."""
 
     message_template: str = "Task completed: {task_subject}"
     max_subject_length: int = 80
 
 
-@dataclass
-class PostToolUseFailureHookConfig(HookConfig):
+@dataclass(slots=True)
+class PostToolUseFailureHookConfig(TemplateHookConfig):
     """Configuration for PostToolUseFailure hook."""
 
     message_template: str = "{tool_name} failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserPromptSubmitHookConfig(HookConfig):
     """Configuration for UserPromptSubmit hook (disabled by default)."""
 
     enabled: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class PreCompactHookConfig(HookConfig):
     """Configuration for PreCompact hook."""
 
     message: str = "Compacting context"
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalConfig:
     """Global configuration settings."""
 
@@ -137,7 +200,7 @@ class GlobalConfig:
     project_dir: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Complete hook configuration."""
 
@@ -163,9 +226,32 @@ class Config:
     pre_compact: PreCompactHookConfig = field(default_factory=PreCompactHookConfig)
 
 
-# Cached config instance
-_config: Config | None = None
-_config_path: Path | None = None
+# Module name used when executing the generated config module
+_COMPILED_MODULE_NAME = "_hook_config_compiled"
+
+
+@lru_cache(maxsize=None)
+def _field_info(cls: type) -> dict[str, type | None]:
+    """Map a dataclass's init field names to their nested dataclass type.
+
+    Computed once per class. Annotations are resolved with get_type_hints so
+    string (PEP 563) annotations are handled too.
+
+    Args:
+        cls: Dataclass type to inspect
+
+    Returns:
+        Dict of field name -> nested dataclass type, or None for plain fields
+    """
+    hints = get_type_hints(cls)
+    info: dict[str, type | None] = {}
+    for f in fields(cls):
+        if not f.init:
+            continue
+        field_type = hints.get(f.name, f.type)
+        is_nested = isinstance(field_type, type) and is_dataclass(field_type)
+        info[f.name] = field_type if is_nested else None
+    return info
 
 
 def _dict_to_dataclass(data: dict[str, Any], cls: type) -> Any:
@@ -173,15 +259,15 @@ def _dict_to_dataclass(data: dict[str, Any], cls: type) -> Any:
     if not isinstance(data, dict):
         return data
 
-    field_types = {f.name: f.type for f in cls.__dataclass_fields__.values()}
+    field_info = _field_info(cls)
     kwargs = {}
 
     for key, value in data.items():
-        if key in field_types:
-            field_type = field_types[key]
+        if key in field_info:
+            nested_cls = field_info[key]
             # Handle nested dataclasses
-            if hasattr(field_type, "__dataclass_fields__"):
-                kwargs[key] = _dict_to_dataclass(value, field_type)
+            if nested_cls is not None:
+                kwargs[key] = _dict_to_dataclass(value, nested_cls)
             else:
                 kwargs[key] = value
 
@@ -215,39 +301,100 @@ def _load_hook_config(hook_data: dict[str, Any], cls: type) -> Any:
     return _dict_to_dataclass(data, cls)
 
 
-def load_config(config_path: str | Path | None = None, force_reload: bool = False) -> Config:
-    """Load configuration from YAML file.
+def _get_compiled_path(config_path: Path) -> Path:
+    """Get the path of the generated config module that sits next to config.yaml."""
+    return config_path.with_name(f"{config_path.stem}_compiled.py")
+
+
+def _dataclass_names(obj: Any, names: set[str]) -> set[str]:
+    """Collect the class names of a dataclass instance and all nested ones."""
+    names.add(type(obj).__name__)
+    for name, nested_cls in _field_info(type(obj)).items():
+        if nested_cls is not None:
+            _dataclass_names(getattr(obj, name), names)
+    return names
+
+
+def _read_compiled(compiled_path: Path, mtime_ns: int) -> Config | None:
+    """Load the generated config module if it was built from the current YAML.
+
+    The module is executed fresh on every call (never via sys.modules), so
+    each caller gets its own Config instance. Python's bytecode cache makes
+    this a constant load rather than a parse.
 
     Args:
-        config_path: Path to config.yaml. If None, uses default location.
-        force_reload: If True, ignore cached config and reload from disk.
+        compiled_path: Path to the generated module
+        mtime_ns: st_mtime_ns of the YAML file
 
     Returns:
-        Config object with all settings.
+        Compiled Config, or None on a miss or an unusable module
     """
-    global _config, _config_path
+    try:
+        spec = importlib.util.spec_from_file_location(_COMPILED_MODULE_NAME, compiled_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        # Missing, corrupted, or built by an incompatible version — rebuild from YAML
+        return None
 
-    if config_path is None:
-        # Default to config.yaml in the same directory as this file
-        config_path = Path(__file__).parent.parent / "config.yaml"
-    else:
-        config_path = Path(config_path)
+    if getattr(module, "_yaml_mtime_ns", None) != mtime_ns:
+        return None
 
-    # Return cached config if available and path matches
-    if not force_reload and _config is not None and _config_path == config_path:
-        return _config
+    config = getattr(module, "CONFIG", None)
+    return config if isinstance(config, Config) else None
 
-    # Load YAML file
-    if not config_path.exists():
-        # Return default config if file doesn't exist
-        _config = Config()
-        _config_path = config_path
-        return _config
 
-    with open(config_path) as f:
-        data = yaml.safe_load(f) or {}
+def _write_compiled(compiled_path: Path, mtime_ns: int, config: Config) -> None:
+    """Atomically write the generated config module and its bytecode.
 
-    # Build config from loaded data
+    The module is a literal built from the dataclass reprs. Its .pyc is
+    written hash-checked, so a rewrite within the same second can never be
+    masked by a stale timestamp-validated .pyc.
+
+    Args:
+        compiled_path: Path to the generated module
+        mtime_ns: st_mtime_ns of the YAML file the config was built from
+        config: Config built from the YAML, before environment overrides
+    """
+    import py_compile
+
+    names = ", ".join(sorted(_dataclass_names(config, set())))
+    source = (
+        f"# Generated from {compiled_path.stem.removesuffix('_compiled')}.yaml"
+        " by lib/config.py. Do not edit; delete to rebuild.\n"
+        f"from {Config.__module__} import {names}\n"
+        "\n"
+        f"_yaml_mtime_ns = {mtime_ns}\n"
+        f"CONFIG = {config!r}\n"
+    )
+
+    tmp_path = compiled_path.with_name(f"{compiled_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(source)
+        os.replace(tmp_path, compiled_path)
+        py_compile.compile(
+            str(compiled_path),
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+        )
+    except (IOError, OSError, py_compile.PyCompileError):
+        # Cache is an optimization only — silently fail on write errors
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _build_config(data: dict[str, Any]) -> Config:
+    """Build a Config from parsed YAML data.
+
+    Args:
+        data: Parsed contents of config.yaml
+
+    Returns:
+        Config object with all settings from the file
+    """
     config = Config()
 
     # Global settings
@@ -304,6 +451,15 @@ def load_config(config_path: str | Path | None = None, force_reload: bool = Fals
     if "pre_compact" in hooks:
         config.pre_compact = _load_hook_config(hooks["pre_compact"], PreCompactHookConfig)
 
+    return config
+
+
+def _apply_overrides(config: Config) -> None:
+    """Apply environment variable overrides and resolve project_dir.
+
+    Args:
+        config: Config to update in place
+    """
     # Apply environment variable overrides
     if os.environ.get("HOOK_DEBUG"):
         config.global_config.debug = os.environ["HOOK_DEBUG"].lower() in ("1", "true", "yes")
@@ -315,14 +471,49 @@ def load_config(config_path: str | Path | None = None, force_reload: bool = Fals
     if not config.global_config.project_dir:
         config.global_config.project_dir = os.getcwd()
 
-    # Cache and return
-    _config = config
-    _config_path = config_path
+
+def load_config(config_path: str | Path | None = None) -> Config:
+    """Load configuration from YAML file.
+
+    The parsed config is written out as a sibling Python module
+    (config_compiled.py) tagged with the YAML's mtime, so later hook processes
+    load it from bytecode and skip YAML parsing until config.yaml changes.
+
+    Args:
+        config_path: Path to config.yaml. If None, uses default location.
+
+    Returns:
+        Config object with all settings.
+    """
+    if config_path is None:
+        # Default to config.yaml in the same directory as this file
+        config_path = Path(__file__).parent.parent / "config.yaml"
+    else:
+        config_path = Path(config_path)
+
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except OSError:
+        # Return default config if file doesn't exist
+        return Config()
+
+    compiled_path = _get_compiled_path(config_path)
+    config = _read_compiled(compiled_path, mtime_ns)
+
+    if config is None:
+        # Imported here so cache hits never pay for PyYAML
+        import yaml
+
+        with open(config_path) as f:
+            data = yaml.safe_load(f) or {}
+
+        config = _build_config(data)
+        _write_compiled(compiled_path, mtime_ns, config)
+
+    _apply_overrides(config)
     return config
 
 
 def get_config() -> Config:
-    """Get the current configuration, loading if necessary."""
-    if _config is None:
-        return load_config()
-    return _config
+    """Load the configuration from the default location."""
+    return load_config()
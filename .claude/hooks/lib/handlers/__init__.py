@@ -1,29 +1,63 @@
-"""Hook handlers for different Claude Code events."""
+"""Hook handlers for different Claude Code events.
 
-from .base import BaseHandler
-from .stop import StopHandler
-from .ask_user import AskUserQuestionHandler
-from .permission import PermissionRequestHandler
-from .notification import NotificationHandler
-from .subagent_start import SubagentStartHandler
-from .subagent_stop import SubagentStopHandler
-from .teammate_idle import TeammateIdleHandler
-from .task_completed import TaskCompletedHandler
-from .tool_failure import PostToolUseFailureHandler
-from .user_prompt_submit import UserPromptSubmitHandler
-from .pre_compact import PreCompactHandler
+Handler classes are imported lazily (PEP 562) so a hook process only pays
+for the one handler module it dispatches to.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ask_user import AskUserQuestionHandler
+    from .base import BaseHandler
+    from .notification import NotificationHandler
+    from .permission import PermissionRequestHandler
+    from .pre_compact import PreCompactHandler
+    from .stop import StopHandler
+    from .subagent_start import SubagentStartHandler
+    from .subagent_stop import SubagentStopHandler
+    from .task_completed import TaskCompletedHandler
+    from .teammate_idle import TeammateIdleHandler
+    from .tool_failure import PostToolUseFailureHandler
+    from .user_prompt_submit import UserPromptSubmitHandler
+
+# Handler class name -> submodule that defines it
+_HANDLER_MODULES = {
+    "BaseHandler": "base",
+    "StopHandler": "stop",
+    "AskUserQuestionHandler": "ask_user",
+    "PermissionRequestHandler": "permission",
+    "NotificationHandler": "notification",
+    "SubagentStartHandler": "subagent_start",
+    "SubagentStopHandler": "subagent_stop",
+    "TeammateIdleHandler": "teammate_idle",
+    "TaskCompletedHandler": "task_completed",
+    "PostToolUseFailureHandler": "tool_failure",
+    "UserPromptSubmitHandler": "user_prompt_submit",
+    "PreCompactHandler": "pre_compact",
+}
 
 __all__ = [
-    "BaseHandler",
-    "StopHandler",
     "AskUserQuestionHandler",
-    "PermissionRequestHandler",
+    "BaseHandler",
     "NotificationHandler",
+    "PermissionRequestHandler",
+    "PostToolUseFailureHandler",
+    "PreCompactHandler",
+    "StopHandler",
     "SubagentStartHandler",
     "SubagentStopHandler",
-    "TeammateIdleHandler",
     "TaskCompletedHandler",
-    "PostToolUseFailureHandler",
+    "TeammateIdleHandler",
     "UserPromptSubmitHandler",
-    "PreCompactHandler",
 ]
+
+
+def __getattr__(name: str):
+    """Import a handler class on first access."""
+    module_name = _HANDLER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    handler_cls = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = handler_cls
+    return handler_cls
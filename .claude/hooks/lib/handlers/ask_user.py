@@ -1,5 +1,7 @@
 """AskUserQuestion hook handler for question notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import AskUserQuestionHookConfig
 from ..state import mark_handled
@@ -13,7 +15,7 @@ class AskUserQuestionHandler(BaseHandler):
     Marks state to prevent duplicate notifications from Stop hook.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> AskUserQuestionHookConfig:
         """Get ask_user_question-specific hook configuration."""
         return self.config.ask_user_question
@@ -29,10 +31,7 @@ class AskUserQuestionHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for question notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Extract question from tool input."""
@@ -1,10 +1,15 @@
 """Base handler class for Claude Code hooks."""
 
+import io
+import os
+import time
 from abc import ABC, abstractmethod
-from pathlib import Path
+from functools import cached_property
+from typing import BinaryIO
 
 from ..audio import AudioSettings, play_notification
-from ..config import Config, get_config
+from ..config import Config, HookConfig, get_config
+from ..hook_input import parse_hook_json
 
 
 class BaseHandler(ABC):
@@ -17,7 +22,19 @@ class BaseHandler(ABC):
             config: Configuration object. If None, loads from default location.
         """
         self.config = config or get_config()
-        self._debug_log: list[str] = []
+        # Only buffer log lines when they will actually be written out
+        self._debug_log: io.StringIO | None = io.StringIO() if self.debug_enabled else None
+
+    @property
+    @abstractmethod
+    def hook_config(self) -> HookConfig:
+        """Get this handler's hook configuration."""
+        ...
+
+    @cached_property
+    def _audio_settings(self) -> AudioSettings:
+        """Audio settings from hook_config, built once per handler."""
+        return AudioSettings.from_configs(self.hook_config.sound, self.hook_config.voice)
 
     @property
     def project_dir(self) -> str:
@@ -30,33 +47,44 @@ class BaseHandler(ABC):
         return self.config.global_config.debug
 
     @property
-    def debug_dir(self) -> Path:
+    def debug_dir(self) -> str:
         """Get the debug output directory."""
-        return Path(self.project_dir) / self.config.global_config.debug_dir
+        return os.path.join(self.project_dir, self.config.global_config.debug_dir)
 
     def log(self, message: str) -> None:
-        """Add a message to the debug log.
+        """Add a message to the debug log. No-op when debug is disabled.
 
         Args:
             message: Message to log
         """
-        self._debug_log.append(message)
+        if self._debug_log is not None:
+            self._debug_log.write(message)
+            self._debug_log.write("\n")
 
     def write_debug_log(self, filename: str = "hook_debug.log") -> None:
-        """Write debug log to file if debug is enabled.
+        """Append the debug log to file if debug is enabled.
+
+        Each run is written with a single append under a timestamp header,
+        so history from earlier hook runs is kept.
 
         Args:
             filename: Name of the debug log file
         """
-        if not self.debug_enabled:
+        if self._debug_log is None:
             return
 
-        debug_path = self.debug_dir / filename
-        debug_path.parent.mkdir(parents=True, exist_ok=True)
+        debug_dir = self.debug_dir
+        debug_path = os.path.join(debug_dir, filename)
 
         try:
-            with open(debug_path, "w") as f:
-                f.write("\n".join(self._debug_log))
+            os.makedirs(debug_dir, exist_ok=True)
+            header = f"--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---\n"
+            payload = (header + self._debug_log.getvalue()).encode()
+            fd = os.open(debug_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
         except (IOError, OSError):
             pass
 
@@ -97,10 +125,25 @@ class BaseHandler(ABC):
         """Called after should_handle passes, before get_message. No-op by default."""
         pass
 
+    def _can_play_audio(self, data: dict) -> bool:  # noqa: ARG002
+        """Whether any audio could play. Default checks get_audio_settings()."""
+        return self.get_audio_settings().is_audible
+
     def _resolve_audio_settings(self, data: dict) -> AudioSettings:
         """Resolve audio settings. Default delegates to get_audio_settings()."""
         return self.get_audio_settings()
 
+    def handle_stream(self, stream: BinaryIO) -> None:
+        """Entry point when the event was given on the command line (``--event``).
+
+        Parses the hook JSON from stream and delegates to handle(). Subclasses
+        that only need a few fields can override this to parse less.
+
+        Args:
+            stream: Binary stream holding the raw hook JSON
+        """
+        self.handle(parse_hook_json(stream.read()))
+
     def handle(self, data: dict) -> None:
         """Main entry point for handling hook events.
 
@@ -122,6 +165,12 @@ class BaseHandler(ABC):
 
         self._pre_message_hook(data)
 
+        # Nothing to play — skip message extraction (may read the transcript)
+        if not self._can_play_audio(data):
+            self.log("audio: fully disabled - skipping")
+            self.write_debug_log()
+            return
+
         message = self.get_message(data)
         if not message:
             self.log("message: None - skipping notification")
@@ -1,5 +1,7 @@
 """Notification hook handler for system notification events."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import NotificationHookConfig
 from ..state import mark_handled
@@ -13,7 +15,7 @@ class NotificationHandler(BaseHandler):
     or auth success events.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> NotificationHookConfig:
         """Get notification-specific hook configuration."""
         return self.config.notification
@@ -24,22 +26,13 @@ class NotificationHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Map notification type to configured message."""
         notification_type = data.get("notification_type", "")
         cfg = self.hook_config
-
-        messages = {
-            "idle_prompt": cfg.idle_message,
-            "auth_success": cfg.auth_message,
-        }
-
-        return messages.get(notification_type, cfg.default_message)
+        return cfg.messages_by_type.get(notification_type, cfg.default_message)
 
     def _pre_message_hook(self, data: dict) -> None:
         """Mark idle notifications as handled for Stop dedup."""
@@ -1,5 +1,7 @@
 """PermissionRequest hook handler for approval notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import PermissionRequestHookConfig
 from ..state import mark_handled, set_last_spoken, was_already_spoken
@@ -15,7 +17,7 @@ class PermissionRequestHandler(BaseHandler):
     Marks state to prevent duplicate notifications from Stop hook.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> PermissionRequestHookConfig:
         """Get permission_request-specific hook configuration."""
         return self.config.permission_request
@@ -26,10 +28,7 @@ class PermissionRequestHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for permission notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Extract tool name and format permission message.
@@ -76,12 +75,12 @@ class PermissionRequestHandler(BaseHandler):
                     session_id = data.get("session_id", "")
                     if session_id and was_already_spoken(session_id, summary):
                         self.log("summary already spoken — falling back to template")
-                        return self.hook_config.message_template.format(tool_name=tool_name)
+                        return self.hook_config.format_message(tool_name=tool_name)
                     if session_id:
                         set_last_spoken(session_id, summary)
                     return summary
 
-        return self.hook_config.message_template.format(tool_name=tool_name)
+        return self.hook_config.format_message(tool_name=tool_name)
 
     def _pre_message_hook(self, data: dict) -> None:
         """Mark as handled for deduplication before processing."""
@@ -1,5 +1,7 @@
 """PreCompact hook handler for context compaction notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import PreCompactHookConfig
 from .base import BaseHandler
@@ -11,7 +13,7 @@ class PreCompactHandler(BaseHandler):
     Notifies when context is about to be compacted.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> PreCompactHookConfig:
         """Get pre_compact-specific hook configuration."""
         return self.config.pre_compact
@@ -22,10 +24,7 @@ class PreCompactHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for pre-compact notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:  # noqa: ARG002
         """Return static compaction message."""
@@ -1,14 +1,96 @@
 """Stop hook handler for task completion notifications."""
 
+import atexit
 import json
+import os
+import queue
+import shutil
+import threading
+from functools import cached_property
 
 from ..audio import AudioSettings
 from ..config import StopHookConfig
-from ..state import was_handled
-from ..summary import SummaryConfig, extract_last_question, extract_summary
-from ..transcript import MessageInfo, get_transcript_path, read_last_assistant_text, read_transcript
+from ..state import get_handled
+from ..summary import SummaryConfig, ends_with_question, extract_summary, extract_summary_and_question
+from ..transcript import MessageInfo, get_transcript_path, read_transcript_info
 from .base import BaseHandler
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Events whose notification makes the Stop input-waiting prompt a duplicate
+DEDUP_EVENT_TYPES = ("ask_user", "permission", "notification_idle", "tool_failure")
+
+# Debug dumps are written by a background thread so they stay off the
+# notification path. Dumps queued while the writer is behind are dropped.
+DEBUG_DUMP_QUEUE_SIZE = 16
+
+_debug_dumps: queue.Queue | None = None
+_debug_writer: threading.Thread | None = None
+
+
+def _write_debug_dumps(dumps: queue.Queue) -> None:
+    """Write queued (debug_dir, transcript_path, data) dumps until a None sentinel."""
+    while True:
+        item = dumps.get()
+        if item is None:
+            return
+        debug_dir, transcript_path, data = item
+
+        # Copy transcript for debugging
+        try:
+            os.makedirs(debug_dir, exist_ok=True)
+            shutil.copyfile(transcript_path, os.path.join(debug_dir, "transcript_dump.jsonl"))
+        except (IOError, OSError):
+            pass
+
+        # Save raw input for debugging
+        try:
+            if orjson is not None:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2).encode()
+            with open(os.path.join(debug_dir, "hook_raw_input.json"), "wb") as f:
+                f.write(payload)
+        except (IOError, OSError, TypeError, ValueError):
+            pass
+
+
+def _flush_debug_dumps() -> None:
+    """Let the writer finish queued dumps before the process exits."""
+    if _debug_dumps is not None and _debug_writer is not None:
+        _debug_dumps.put(None)
+        _debug_writer.join(timeout=5.0)
+
+
+def _queue_debug_dump(debug_dir: str, transcript_path: str, data: dict) -> bool:
+    """Queue debug dumps of the transcript and raw hook input.
+
+    Args:
+        debug_dir: Directory to write the dumps to
+        transcript_path: Transcript to copy
+        data: Raw hook data to save
+
+    Returns:
+        True if queued, False if dropped because the queue is full
+    """
+    global _debug_dumps, _debug_writer
+    if _debug_writer is None:
+        _debug_dumps = queue.Queue(maxsize=DEBUG_DUMP_QUEUE_SIZE)
+        _debug_writer = threading.Thread(
+            target=_write_debug_dumps, args=(_debug_dumps,), name="debug-dumps", daemon=True
+        )
+        _debug_writer.start()
+        atexit.register(_flush_debug_dumps)
+
+    try:
+        _debug_dumps.put_nowait((debug_dir, transcript_path, data))
+    except queue.Full:
+        return False
+    return True
+
 
 class StopHandler(BaseHandler):
     """Handler for the Stop hook event.
@@ -21,7 +103,7 @@ class StopHandler(BaseHandler):
         super().__init__(config)
         self._use_input_settings = False
 
-    @property
+    @cached_property
     def hook_config(self) -> StopHookConfig:
         """Get stop-specific hook configuration."""
         return self.config.stop
@@ -32,19 +114,18 @@ class StopHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for task completion."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def _get_input_audio_settings(self) -> AudioSettings:
         """Get audio settings for input waiting notification."""
+        return self._input_audio_settings
+
+    @cached_property
+    def _input_audio_settings(self) -> AudioSettings:
+        """Input-waiting audio settings, built once per handler."""
         # Use AskUserQuestion settings for input waiting
         ask_config = self.config.ask_user_question
-        return AudioSettings(
-            sound=ask_config.sound,
-            voice=ask_config.voice,
-        )
+        return AudioSettings.from_configs(ask_config.sound, ask_config.voice)
 
     def _detect_input_waiting(self, message_info: MessageInfo) -> tuple[bool, str | None]:
         """Detect if Claude is waiting for user input.
@@ -69,15 +150,14 @@ class StopHandler(BaseHandler):
         # Priority 2: Check if text ends with question mark
         # Signal input-waiting for audio settings, but let get_message()
         # decide whether to speak the summary or the question.
-        text = message_info.text or ""
-        if text.strip().endswith("?"):
+        if ends_with_question(message_info.text or ""):
             return True, None
 
         # Priority 3: Check if message ends with tool_use (waiting for permission)
         if message_info.ends_with_tool_use:
             tool_name = message_info.last_tool_name or "tool"
             perm_config = self.config.permission_request
-            return True, perm_config.message_template.format(tool_name=tool_name)
+            return True, perm_config.format_message(tool_name=tool_name)
 
         return False, None
 
@@ -94,30 +174,23 @@ class StopHandler(BaseHandler):
         if not session_id:
             return False
 
-        # Check if AskUserQuestion was already handled
-        if was_handled(session_id, "ask_user"):
-            self.log("dedup: ask_user already handled - skipping")
-            return True
-
-        # Check if PermissionRequest was already handled
-        if was_handled(session_id, "permission"):
-            self.log("dedup: permission already handled - skipping")
-            return True
-
-        # Check if Notification (idle_prompt) was already handled
-        if was_handled(session_id, "notification_idle"):
-            self.log("dedup: notification_idle already handled - skipping")
-            return True
-
-        # Check if PostToolUseFailure was already handled
-        if was_handled(session_id, "tool_failure"):
-            self.log("dedup: tool_failure already handled - skipping")
-            return True
+        # AskUserQuestion, PermissionRequest, Notification (idle_prompt) and
+        # PostToolUseFailure all speak before Stop; one state read covers them all
+        handled = get_handled(session_id)
+        for event_type in DEDUP_EVENT_TYPES:
+            if event_type in handled:
+                self.log(f"dedup: {event_type} already handled - skipping")
+                return True
 
         return False
 
     def get_message(self, data: dict) -> str | None:
         """Extract message from stop event data."""
+        # handle() already gates on should_handle(); this guards direct calls
+        # from waiting up to 2s for the transcript of a disabled hook
+        if not self.hook_config.enabled:
+            return None
+
         # Get transcript path
         transcript_path, fallback_used = get_transcript_path(
             data, self.project_dir, wait_timeout=2.0
@@ -129,28 +202,13 @@ class StopHandler(BaseHandler):
             self.log("No transcript found")
             return None
 
-        # Copy transcript for debugging
-        if self.debug_enabled and transcript_path:
-            try:
-                dump_path = self.debug_dir / "transcript_dump.jsonl"
-                dump_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(transcript_path) as src:
-                    with open(dump_path, "w") as dst:
-                        dst.write(src.read())
-            except (IOError, OSError):
-                pass
+        # Dump transcript and raw input for debugging (written in the background)
+        if self.debug_enabled and not _queue_debug_dump(self.debug_dir, transcript_path, data):
+            self.log("debug dumps: queue full - dropped")
 
-        # Save raw input for debugging
-        if self.debug_enabled:
-            try:
-                input_path = self.debug_dir / "hook_raw_input.json"
-                with open(input_path, "w") as f:
-                    json.dump(data, f, indent=2)
-            except (IOError, OSError):
-                pass
-
-        # Read transcript
-        message_info = read_transcript(transcript_path)
+        # Read transcript (parsed once; the dedup fallback below reuses it)
+        transcript = read_transcript_info(transcript_path)
+        message_info = transcript.last
         if not message_info:
             self.log("No message info from transcript")
             return None
@@ -173,10 +231,10 @@ class StopHandler(BaseHandler):
                 # Dedup suppressed the input-waiting notification (permission/question
                 # already handled). But this is still a Stop event — if there's
                 # meaningful text from earlier in the turn, speak the summary instead
-                # of going silent. Use read_last_assistant_text to find text from an
+                # of going silent. Use the last assistant text to find text from an
                 # earlier assistant message (the last one may be tool-only).
                 self.log("dedup: falling through to summary extraction")
-                text = read_last_assistant_text(transcript_path)
+                text = transcript.last_text
                 if text:
                     message_info = MessageInfo(text=text)
                 else:
@@ -189,7 +247,7 @@ class StopHandler(BaseHandler):
                     # AskUserQuestion or ends-with-tool-use — speak the specific prompt
                     return question
                 # Text ends with ? — fall through to extract action summary below.
-                # If no action summary found, extract_last_question as fallback.
+                # If no action summary found, the last question is the fallback.
 
         if not is_waiting:
             # Normal task completion
@@ -208,7 +266,12 @@ class StopHandler(BaseHandler):
             start=summary_cfg.start,
         )
 
-        summary = extract_summary(message_info.text, config)
+        # Input-waiting may fall back to the question: split the text only once
+        question = None
+        if self._use_input_settings:
+            summary, question = extract_summary_and_question(message_info.text, config)
+        else:
+            summary = extract_summary(message_info.text, config)
         self.log(f"summary: {summary}")
 
         if summary and summary != "Task completed":
@@ -216,13 +279,16 @@ class StopHandler(BaseHandler):
 
         # If input-waiting (text ended with ?) and no action summary, speak the question
         if self._use_input_settings:
-            question = extract_last_question(message_info.text)
             if question:
                 return question
             return self.config.ask_user_question.default_message
 
         return summary
 
+    def _can_play_audio(self, data: dict) -> bool:  # noqa: ARG002
+        """Either the task-completion or the input-waiting settings may be used."""
+        return self.get_audio_settings().is_audible or self._get_input_audio_settings().is_audible
+
     def _resolve_audio_settings(self, data: dict) -> AudioSettings:
         """Use input-waiting settings when Claude is waiting for user input."""
         if self._use_input_settings:
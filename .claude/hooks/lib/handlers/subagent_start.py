@@ -1,5 +1,7 @@
 """SubagentStart hook handler for subagent launch notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import SubagentStartHookConfig
 from .base import BaseHandler
@@ -11,7 +13,7 @@ class SubagentStartHandler(BaseHandler):
     Notifies when a subagent is launched.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> SubagentStartHookConfig:
         """Get subagent_start-specific hook configuration."""
         return self.config.subagent_start
@@ -22,12 +24,9 @@ class SubagentStartHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for subagent start notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Format subagent start message from template."""
         agent_type = data.get("agent_type", "unknown")
-        return self.hook_config.message_template.format(agent_type=agent_type)
+        return self.hook_config.format_message(agent_type=agent_type)
@@ -1,5 +1,7 @@
 """SubagentStop hook handler for subagent completion notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import SubagentStopHookConfig
 from ..state import mark_handled
@@ -12,7 +14,7 @@ class SubagentStopHandler(BaseHandler):
     Notifies when a subagent finishes.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> SubagentStopHookConfig:
         """Get subagent_stop-specific hook configuration."""
         return self.config.subagent_stop
@@ -23,15 +25,12 @@ class SubagentStopHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for subagent stop notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Format subagent stop message from template."""
         agent_type = data.get("agent_type", "unknown")
-        return self.hook_config.message_template.format(agent_type=agent_type)
+        return self.hook_config.format_message(agent_type=agent_type)
 
     def _pre_message_hook(self, data: dict) -> None:
         """Mark as handled for Stop dedup."""
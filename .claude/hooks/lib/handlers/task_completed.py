@@ -1,5 +1,7 @@
 """TaskCompleted hook handler for task completion notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import TaskCompletedHookConfig
 from .base import BaseHandler
@@ -11,7 +13,7 @@ class TaskCompletedHandler(BaseHandler):
     Notifies when a task is completed.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> TaskCompletedHookConfig:
         """Get task_completed-specific hook configuration."""
         return self.config.task_completed
@@ -22,15 +24,13 @@ class TaskCompletedHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for task completed notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Format task completed message, truncating subject to max length."""
         task_subject = data.get("task_subject", "unknown task")
         max_len = self.hook_config.max_subject_length
         if len(task_subject) > max_len:
-            task_subject = task_subject[:max_len - 3] + "..."
-        return self.hook_config.message_template.format(task_subject=task_subject)
+            # Clamp so a max_subject_length under 3 can't slice from the end
+            task_subject = task_subject[: max(max_len - 3, 0)] + "..."
+        return self.hook_config.format_message(task_subject=task_subject)
@@ -1,5 +1,7 @@
 """TeammateIdle hook handler for teammate idle notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import TeammateIdleHookConfig
 from .base import BaseHandler
@@ -11,7 +13,7 @@ class TeammateIdleHandler(BaseHandler):
     Notifies when a teammate goes idle.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> TeammateIdleHookConfig:
         """Get teammate_idle-specific hook configuration."""
         return self.config.teammate_idle
@@ -22,12 +24,9 @@ class TeammateIdleHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for teammate idle notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Format teammate idle message from template."""
         teammate_name = data.get("teammate_name", "teammate")
-        return self.hook_config.message_template.format(teammate_name=teammate_name)
+        return self.hook_config.format_message(teammate_name=teammate_name)
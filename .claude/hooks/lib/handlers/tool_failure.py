@@ -1,5 +1,7 @@
 """PostToolUseFailure hook handler for tool failure notifications."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import PostToolUseFailureHookConfig
 from ..state import mark_handled
@@ -12,7 +14,7 @@ class PostToolUseFailureHandler(BaseHandler):
     Notifies when a tool use fails. Skips user-caused interruptions.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> PostToolUseFailureHookConfig:
         """Get tool_failure-specific hook configuration."""
         return self.config.post_tool_use_failure
@@ -32,15 +34,12 @@ class PostToolUseFailureHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for tool failure notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:
         """Format tool failure message from template."""
         tool_name = data.get("tool_name", "tool")
-        return self.hook_config.message_template.format(tool_name=tool_name)
+        return self.hook_config.format_message(tool_name=tool_name)
 
     def _pre_message_hook(self, data: dict) -> None:
         """Mark as handled for Stop dedup."""
@@ -1,5 +1,7 @@
 """UserPromptSubmit hook handler (disabled by default)."""
 
+from functools import cached_property
+
 from ..audio import AudioSettings
 from ..config import UserPromptSubmitHookConfig
 from .base import BaseHandler
@@ -12,7 +14,7 @@ class UserPromptSubmitHandler(BaseHandler):
     Exists as a skeleton for future use.
     """
 
-    @property
+    @cached_property
     def hook_config(self) -> UserPromptSubmitHookConfig:
         """Get user_prompt_submit-specific hook configuration."""
         return self.config.user_prompt_submit
@@ -23,10 +25,7 @@ class UserPromptSubmitHandler(BaseHandler):
 
     def get_audio_settings(self) -> AudioSettings:
         """Get audio settings for user prompt submit notification."""
-        return AudioSettings(
-            sound=self.hook_config.sound,
-            voice=self.hook_config.voice,
-        )
+        return self._audio_settings
 
     def get_message(self, data: dict) -> str | None:  # noqa: ARG002
         """Return None — silent by design."""
@@ -0,0 +1,28 @@
+"""Parsing of the hook JSON that Claude Code writes to stdin."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def parse_hook_json(raw: bytes) -> dict:
+    """Parse a raw hook JSON body, using orjson when it is installed.
+
+    Args:
+        raw: Hook JSON as read from stdin
+
+    Returns:
+        The parsed hook data, or an empty dict if the body is empty or malformed
+    """
+    if not raw:
+        return {}
+    try:
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return {}
@@ -2,9 +2,17 @@
 
 import hashlib
 import json
+import os
+import tempfile
 import time
+from collections.abc import Iterable
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # State file expiry in seconds (prevents stale state across sessions)
 STATE_EXPIRY_SECONDS = 60
@@ -12,6 +20,40 @@ STATE_EXPIRY_SECONDS = 60
 # System temp directory for state files (outside project directory)
 STATE_DIR = "/tmp/claude-hooks"
 
+# Suffix of in-progress state writes; cleanup_stale_states() removes any
+# left behind by a hook killed mid-write
+STATE_TMP_SUFFIX = ".tmp"
+
+# Spoken messages shorter than this are stored verbatim; hashing them costs
+# more than comparing the strings directly
+SPOKEN_VERBATIM_MAX_CHARS = 256
+
+# Parsed state per file, keyed by path -> (st_mtime_ns, st_size, state).
+# A hook process checks and marks the same file several times, so unchanged
+# files are only parsed once; another process writing the file changes its
+# mtime/size and forces a re-read. Each lookup costs one stat() of the file
+# itself: the state directory's mtime is not a usable substitute, since it
+# misses in-place writes and has only clock-tick resolution.
+_state_cache: dict[Path, tuple[int, int, dict]] = {}
+
+
+def _parse_state(raw: bytes) -> dict:
+    """Parse state file contents, using orjson when it is installed.
+
+    Raises:
+        json.JSONDecodeError: If raw is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _serialize_state(state: dict) -> bytes:
+    """Serialize state for writing, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(state)
+    return json.dumps(state).encode()
+
 
 def _get_state_file_path(session_id: str, state_dir: str | None = None) -> Path:
     """Get the path to the state file for a session.
@@ -29,37 +71,73 @@ def _get_state_file_path(session_id: str, state_dir: str | None = None) -> Path:
     return Path(directory) / f".hook_state_{safe_id}.json"
 
 
-def _load_state(state_path: Path) -> dict:
-    """Load state from file, returning empty dict if not found or expired.
+def _read_state(state_path: Path) -> dict:
+    """Read state through the per-process cache.
+
+    The returned dict is shared with the cache and must not be modified;
+    use _load_state() to get a copy for updating.
 
     Args:
         state_path: Path to state file
 
     Returns:
-        State dictionary
+        State dictionary, empty if not found, expired or corrupted
     """
-    if not state_path.exists():
-        return {}
-
     try:
-        with open(state_path) as f:
-            state = json.load(f)
+        st = state_path.stat()
+    except (IOError, OSError):
+        _state_cache.pop(state_path, None)
+        return {}
 
-        # Check expiry
-        timestamp = state.get("timestamp", 0)
-        if time.time() - timestamp > STATE_EXPIRY_SECONDS:
-            # State expired, clean up
-            state_path.unlink(missing_ok=True)
+    cached = _state_cache.get(state_path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        state = cached[2]
+    else:
+        try:
+            with open(state_path, "rb") as f:
+                state = _parse_state(f.read())
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError, OSError):
+            _state_cache.pop(state_path, None)
+            return {}
+        if not isinstance(state, dict):
             return {}
+        _state_cache[state_path] = (st.st_mtime_ns, st.st_size, state)
 
-        return state
-    except (json.JSONDecodeError, IOError, OSError):
+    # Check expiry
+    timestamp = state.get("timestamp", 0)
+    if time.time() - timestamp > STATE_EXPIRY_SECONDS:
+        # State expired, clean up
+        _state_cache.pop(state_path, None)
+        try:
+            state_path.unlink(missing_ok=True)
+        except (IOError, OSError):
+            pass
         return {}
 
+    return state
+
+
+def _load_state(state_path: Path) -> dict:
+    """Load state from file, returning empty dict if not found or expired.
+
+    Args:
+        state_path: Path to state file
+
+    Returns:
+        State dictionary (a copy that is safe to modify)
+    """
+    state = dict(_read_state(state_path))
+    if "handled" in state:
+        state["handled"] = list(state["handled"])
+    return state
+
 
 def _save_state(state_path: Path, state: dict) -> None:
     """Save state to file.
 
+    Writes to a temporary file and renames it over the state file, so a
+    concurrent reader never sees a partially written file.
+
     Args:
         state_path: Path to state file
         state: State dictionary to save
@@ -70,11 +148,27 @@ def _save_state(state_path: Path, state: dict) -> None:
     # Update timestamp
     state["timestamp"] = time.time()
 
+    tmp_path = None
     try:
-        with open(state_path, "w") as f:
-            json.dump(state, f)
+        # Unique per writer, so concurrent hooks never share a temp file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=state_path.parent, prefix=f"{state_path.name}.", suffix=STATE_TMP_SUFFIX
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.write(_serialize_state(state))
+            f.flush()
+            # rename() keeps the inode, so this is also the state file's stat
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, state_path)
+        _state_cache[state_path] = (st.st_mtime_ns, st.st_size, state)
     except (IOError, OSError):
-        pass  # Silently fail on write errors
+        # Silently fail on write errors
+        _state_cache.pop(state_path, None)
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except (IOError, OSError):
+                pass
 
 
 def mark_handled(session_id: str, event_type: str, state_dir: str | None = None) -> None:
@@ -85,12 +179,28 @@ def mark_handled(session_id: str, event_type: str, state_dir: str | None = None)
         event_type: Type of event (e.g., "ask_user", "permission")
         state_dir: Directory to store state files (defaults to STATE_DIR)
     """
+    mark_handled_many(session_id, (event_type,), state_dir)
+
+
+def mark_handled_many(
+    session_id: str,
+    event_types: Iterable[str],
+    state_dir: str | None = None,
+) -> None:
+    """Mark several events as handled with a single state read and write.
+
+    Args:
+        session_id: Unique session identifier
+        event_types: Types of events to mark
+        state_dir: Directory to store state files (defaults to STATE_DIR)
+    """
     state_path = _get_state_file_path(session_id, state_dir)
     state = _load_state(state_path)
 
     handled = state.get("handled", [])
-    if event_type not in handled:
-        handled.append(event_type)
+    for event_type in event_types:
+        if event_type not in handled:
+            handled.append(event_type)
     state["handled"] = handled
 
     _save_state(state_path, state)
@@ -108,10 +218,21 @@ def was_handled(session_id: str, event_type: str, state_dir: str | None = None)
         True if event was already handled
     """
     state_path = _get_state_file_path(session_id, state_dir)
-    state = _load_state(state_path)
+    return event_type in _read_state(state_path).get("handled", ())
 
-    handled = state.get("handled", [])
-    return event_type in handled
+
+def get_handled(session_id: str, state_dir: str | None = None) -> set[str]:
+    """Get every event type handled in a session, from one read of the state file.
+
+    Args:
+        session_id: Unique session identifier
+        state_dir: Directory where state files are stored (defaults to STATE_DIR)
+
+    Returns:
+        Set of handled event types
+    """
+    state_path = _get_state_file_path(session_id, state_dir)
+    return set(_read_state(state_path).get("handled", ()))
 
 
 def clear_state(session_id: str, state_dir: str | None = None) -> None:
@@ -122,14 +243,29 @@ def clear_state(session_id: str, state_dir: str | None = None) -> None:
         state_dir: Directory where state files are stored (defaults to STATE_DIR)
     """
     state_path = _get_state_file_path(session_id, state_dir)
+    _state_cache.pop(state_path, None)
     try:
         state_path.unlink(missing_ok=True)
     except (IOError, OSError):
         pass
 
 
+def _spoken_key(message: str) -> str:
+    """Get the value stored to recognise a spoken message.
+
+    Args:
+        message: The spoken message
+
+    Returns:
+        The message itself if short, otherwise a BLAKE2b digest of it
+    """
+    if len(message) < SPOKEN_VERBATIM_MAX_CHARS:
+        return message
+    return "blake2b:" + hashlib.blake2b(message.encode(), digest_size=16).hexdigest()
+
+
 def set_last_spoken(session_id: str, message: str, state_dir: str | None = None) -> None:
-    """Store a hash of the last spoken message.
+    """Store the last spoken message (or a hash of it, if long).
 
     Args:
         session_id: Unique session identifier
@@ -138,7 +274,7 @@ def set_last_spoken(session_id: str, message: str, state_dir: str | None = None)
     """
     state_path = _get_state_file_path(session_id, state_dir)
     state = _load_state(state_path)
-    state["last_spoken_hash"] = hashlib.md5(message.encode()).hexdigest()
+    state["last_spoken"] = _spoken_key(message)
     _save_state(state_path, state)
 
 
@@ -154,35 +290,37 @@ def was_already_spoken(session_id: str, message: str, state_dir: str | None = No
         True if this message was the last one spoken
     """
     state_path = _get_state_file_path(session_id, state_dir)
-    state = _load_state(state_path)
-    stored = state.get("last_spoken_hash")
+    stored = _read_state(state_path).get("last_spoken")
     if not stored:
         return False
-    return stored == hashlib.md5(message.encode()).hexdigest()
+    return stored == _spoken_key(message)
 
 
 def cleanup_stale_states(state_dir: str | None = None) -> None:
     """Remove all expired state files.
 
+    Expiry is judged from each file's mtime, which _save_state() sets when it
+    stamps the state, so no file has to be opened or parsed. Temp files left
+    by interrupted writes expire the same way.
+
     Args:
         state_dir: Directory where state files are stored (defaults to STATE_DIR)
     """
-    state_dir_path = Path(state_dir if state_dir is not None else STATE_DIR)
-    if not state_dir_path.exists():
-        return
-
+    directory = state_dir if state_dir is not None else STATE_DIR
     current_time = time.time()
 
-    for state_file in state_dir_path.glob(".hook_state_*.json"):
-        try:
-            with open(state_file) as f:
-                state = json.load(f)
-            timestamp = state.get("timestamp", 0)
-            if current_time - timestamp > STATE_EXPIRY_SECONDS:
-                state_file.unlink(missing_ok=True)
-        except (json.JSONDecodeError, IOError, OSError):
-            # Remove corrupted files
+    try:
+        entries = os.scandir(directory)
+    except (IOError, OSError):
+        return
+
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith(".hook_state_") and name.endswith((".json", STATE_TMP_SUFFIX))):
+                continue
             try:
-                state_file.unlink(missing_ok=True)
+                if current_time - entry.stat().st_mtime > STATE_EXPIRY_SECONDS:
+                    os.unlink(entry.path)
             except (IOError, OSError):
                 pass
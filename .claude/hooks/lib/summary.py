@@ -1,7 +1,9 @@
 """Text summarization logic for Claude Code hooks."""
 
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
+from itertools import chain
 
 
 @dataclass
@@ -20,6 +22,33 @@ ACTION_PATTERNS = [
     r"(?:I've |I have |I )?(successfully (?:created|fixed|added|updated|removed|deleted|modified|implemented|refactored|changed|built|set up|configured|installed|moved|renamed|wrote|generated|completed|finished))",
 ]
 
+# All action patterns as one regex, so each sentence is matched once. Leading
+# whitespace is skipped by the pattern itself rather than by strip()ping a
+# copy of every sentence.
+_ACTION_RE = re.compile(
+    r"\s*(?:" + "|".join(f"(?:{p})" for p in ACTION_PATTERNS) + ")", re.IGNORECASE
+)
+
+# Sentence boundary: whitespace following terminal punctuation
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def ends_with_question(text: str) -> bool:
+    """Check whether text ends with "?", ignoring trailing whitespace.
+
+    Same as ``text.strip().endswith("?")`` without copying the string.
+
+    Args:
+        text: Text to check
+
+    Returns:
+        True if the last non-whitespace character is "?"
+    """
+    idx = len(text) - 1
+    while idx >= 0 and text[idx].isspace():
+        idx -= 1
+    return idx >= 0 and text[idx] == "?"
+
 
 def split_sentences(text: str) -> list[str]:
     """Split text into sentences.
@@ -30,7 +59,23 @@ def split_sentences(text: str) -> list[str]:
     Returns:
         List of sentences
     """
-    return re.split(r"(?<=[.!?])\s+", text)
+    return _SENT_SPLIT_RE.split(text)
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Lazily yield the same sentences split_sentences() returns.
+
+    Args:
+        text: Text to split
+
+    Yields:
+        Sentences, in order
+    """
+    pos = 0
+    for match in _SENT_SPLIT_RE.finditer(text):
+        yield text[pos : match.start()]
+        pos = match.end()
+    yield text[pos:]
 
 
 def find_action_start(sentences: list[str]) -> int:
@@ -43,39 +88,32 @@ def find_action_start(sentences: list[str]) -> int:
         Index of first action sentence, or 0 if not found
     """
     for idx, sentence in enumerate(sentences):
-        sentence = sentence.strip()
-        for pattern in ACTION_PATTERNS:
-            if re.match(pattern, sentence, re.IGNORECASE):
-                return idx
+        if _ACTION_RE.match(sentence):
+            return idx
     return 0
 
 
-def extract_summary(text: str | None, config: SummaryConfig | None = None) -> str:
-    """Extract a brief summary from assistant text.
+def _summarize(sentences: Iterator[str], config: SummaryConfig) -> str:
+    """Build a summary from sentences, consuming only as many as it needs.
 
     Args:
-        text: Text to summarize
+        sentences: Sentences of the (stripped) text, in order
         config: Summary configuration settings
 
     Returns:
         Extracted summary or default message
     """
-    if not text:
-        return "Task completed"
-
-    if config is None:
-        config = SummaryConfig()
-
-    # Clean up the text
-    text = text.strip()
-
-    # Split into sentences
-    sentences = split_sentences(text)
-
-    # Determine start index based on mode
-    start_idx = 0
+    # Skip ahead to the first action sentence, keeping what was skipped in
+    # case there is none and the summary has to start from the beginning
     if config.start == "action":
-        start_idx = find_action_start(sentences)
+        skipped: list[str] = []
+        for sentence in sentences:
+            if _ACTION_RE.match(sentence):
+                sentences = chain([sentence], sentences)
+                break
+            skipped.append(sentence)
+        else:
+            sentences = iter(skipped)
 
     # Build summary based on mode
     summary_parts: list[str] = []
@@ -83,8 +121,8 @@ def extract_summary(text: str | None, config: SummaryConfig | None = None) -> st
     if config.mode == "sentences":
         # Extract first N sentences
         sentence_count = 0
-        for idx in range(start_idx, len(sentences)):
-            sentence = sentences[idx].strip()
+        for sentence in sentences:
+            sentence = sentence.strip()
             if not sentence:
                 continue
 
@@ -97,8 +135,8 @@ def extract_summary(text: str | None, config: SummaryConfig | None = None) -> st
     else:  # "characters" mode
         current_length = 0
 
-        for idx in range(start_idx, len(sentences)):
-            sentence = sentences[idx].strip()
+        for sentence in sentences:
+            sentence = sentence.strip()
             if not sentence:
                 continue
 
@@ -124,6 +162,66 @@ def extract_summary(text: str | None, config: SummaryConfig | None = None) -> st
     return "Task completed"
 
 
+def _last_question(sentences: list[str]) -> str | None:
+    """Find the last sentence ending with a question mark.
+
+    Args:
+        sentences: Sentences of the text, in order
+
+    Returns:
+        The last question sentence, or None if not found
+    """
+    for sentence in reversed(sentences):
+        if ends_with_question(sentence):
+            return sentence.strip()
+    return None
+
+
+def extract_summary(text: str | None, config: SummaryConfig | None = None) -> str:
+    """Extract a brief summary from assistant text.
+
+    Args:
+        text: Text to summarize
+        config: Summary configuration settings
+
+    Returns:
+        Extracted summary or default message
+    """
+    if not text:
+        return "Task completed"
+
+    if config is None:
+        config = SummaryConfig()
+
+    # Split lazily: only as much text as the summary needs is scanned
+    return _summarize(_iter_sentences(text.strip()), config)
+
+
+def extract_summary_and_question(
+    text: str | None,
+    config: SummaryConfig | None = None,
+) -> tuple[str, str | None]:
+    """Extract both the summary and the last question, splitting the text once.
+
+    Equivalent to calling extract_summary() and extract_last_question().
+
+    Args:
+        text: Text to summarize
+        config: Summary configuration settings
+
+    Returns:
+        Tuple of (summary or default message, last question or None)
+    """
+    if not text:
+        return "Task completed", None
+
+    if config is None:
+        config = SummaryConfig()
+
+    sentences = split_sentences(text.strip())
+    return _summarize(iter(sentences), config), _last_question(sentences)
+
+
 def extract_last_question(text: str | None) -> str | None:
     """Extract the last question from text.
 
@@ -136,9 +234,4 @@ def extract_last_question(text: str | None) -> str | None:
     if not text:
         return None
 
-    sentences = split_sentences(text)
-    # Find last sentence ending with ?
-    for sentence in reversed(sentences):
-        if sentence.strip().endswith("?"):
-            return sentence.strip()
-    return None
+    return _last_question(split_sentences(text))
@@ -2,12 +2,36 @@
 
 import json
 import os
+import select
+import struct
+import sys
+import threading
 import time
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import BinaryIO
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+# Where Claude Code keeps per-project transcripts; $HOME is fixed for the
+# life of a hook process, so this is expanded once at import
+CLAUDE_PROJECTS_DIR = os.path.expanduser("~/.claude/projects")
+
+# inotify(7) constants, for waiting on the transcript without watchfiles
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (name follows)
+
+# Bytes read per chunk when scanning JSONL transcripts
+JSONL_CHUNK_SIZE = 65536
+
+
+@dataclass(slots=True)
 class MessageInfo:
     """Information extracted from an assistant message."""
 
@@ -18,9 +42,129 @@ class MessageInfo:
     ask_user_question_input: dict | None = None
 
 
+@dataclass(frozen=True)
+class TranscriptInfo:
+    """What one transcript scan found about the latest assistant messages."""
+
+    last: MessageInfo | None = None  # The very last assistant message
+    last_text: str | None = None  # Text of the last assistant message that has text
+
+
+def _wait_with_watchfiles(path: str, timeout: float, interval: float) -> bool | None:
+    """Wait for a file using OS file-change notifications (inotify/FSEvents).
+
+    Wakes as soon as the file is created instead of on the next poll tick.
+    The watcher also re-checks every ``interval`` seconds, so a file created
+    just before the watch starts is still noticed promptly.
+
+    Args:
+        path: Path to file
+        timeout: Maximum wait time in seconds
+        interval: Fallback re-check interval in seconds
+
+    Returns:
+        True if file exists, False if timeout, or None if watchfiles is
+        unavailable or the parent directory cannot be watched
+    """
+    try:
+        import watchfiles
+    except ImportError:
+        return None
+
+    target = os.path.abspath(path)
+    parent = os.path.dirname(target)
+    if not os.path.isdir(parent):
+        return None
+
+    deadline = time.monotonic() + timeout
+    try:
+        for _ in watchfiles.watch(
+            parent,
+            watch_filter=lambda _change, changed: changed == target,
+            step=10,
+            rust_timeout=max(1, int(interval * 1000)),
+            yield_on_timeout=True,
+            recursive=False,
+            raise_interrupt=False,
+        ):
+            if os.path.exists(target):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+    except Exception:
+        return None
+    return os.path.exists(target)
+
+
+def _wait_with_inotify(path: str, timeout: float) -> bool | None:
+    """Wait for a file using Linux inotify directly through libc.
+
+    Used when watchfiles is not installed. Watches the parent directory for
+    the file being created or renamed into place.
+
+    Args:
+        path: Path to file
+        timeout: Maximum wait time in seconds
+
+    Returns:
+        True if file exists, False if timeout, or None if inotify is
+        unavailable or the parent directory cannot be watched
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    import ctypes
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+
+    target = os.path.abspath(path)
+    parent, name = os.path.split(target)
+    fd = inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+
+    try:
+        if inotify_add_watch(fd, os.fsencode(parent), _IN_CREATE | _IN_MOVED_TO) < 0:
+            return None
+        # The file may have appeared before the watch was in place
+        if os.path.exists(target):
+            return True
+
+        wanted = os.fsencode(name)
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                break
+            try:
+                events = os.read(fd, 4096)
+            except BlockingIOError:
+                continue
+            pos = 0
+            while pos + _INOTIFY_EVENT.size <= len(events):
+                name_len = _INOTIFY_EVENT.unpack_from(events, pos)[3]
+                pos += _INOTIFY_EVENT.size
+                if events[pos : pos + name_len].rstrip(b"\0") == wanted:
+                    return True
+                pos += name_len
+        return os.path.exists(target)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
 def wait_for_file(path: str | Path, timeout: float = 2.0, interval: float = 0.1) -> bool:
     """Wait for a file to exist, with timeout.
 
+    Uses file-change notifications via watchfiles when it is installed, then
+    raw inotify on Linux, and falls back to polling otherwise.
+
     Args:
         path: Path to file
         timeout: Maximum wait time in seconds
@@ -32,6 +176,15 @@ def wait_for_file(path: str | Path, timeout: float = 2.0, interval: float = 0.1)
     if not path:
         return False
 
+    if os.path.exists(path):
+        return True
+
+    found = _wait_with_watchfiles(str(path), timeout, interval)
+    if found is None:
+        found = _wait_with_inotify(str(path), timeout)
+    if found is not None:
+        return found
+
     elapsed = 0.0
     while elapsed < timeout:
         if os.path.exists(path):
@@ -41,6 +194,59 @@ def wait_for_file(path: str | Path, timeout: float = 2.0, interval: float = 0.1)
     return False
 
 
+# Directory listings reused across find_recent_transcript() calls, keyed by
+# directory path -> (st_mtime_ns, entries). A directory's mtime changes
+# whenever an entry is added, removed or renamed, so a matching mtime means
+# the listing is still current. File mtimes are still checked on every call,
+# because appending to a transcript does not touch its directory.
+_listing_cache: dict[str, tuple[int, list["_DirListing"]]] = {}
+
+# Directory mtimes only advance once per clock tick, so a listing taken
+# within this long of the last change may miss an entry added in the same
+# tick; such listings are not cached.
+_LISTING_SETTLE_NS = 2_000_000_000
+_listing_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class _DirListing:
+    """One directory entry, as reported by os.scandir()."""
+
+    name: str
+    path: str
+    is_dir: bool
+
+
+def _scan_dir_cached(path: str) -> list[_DirListing]:
+    """List a directory, reusing the previous listing if it has not changed.
+
+    Uses os.scandir(), so entry types come from the directory read itself
+    instead of a stat() per entry.
+
+    Args:
+        path: Directory to list
+
+    Returns:
+        Entries in the directory
+
+    Raises:
+        OSError: If the directory cannot be read
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    with _listing_lock:
+        cached = _listing_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+    with os.scandir(path) as it:
+        entries = [_DirListing(e.name, e.path, e.is_dir()) for e in it]
+
+    if time.time_ns() - mtime_ns > _LISTING_SETTLE_NS:
+        with _listing_lock:
+            _listing_cache[path] = (mtime_ns, entries)
+    return entries
+
+
 def find_recent_transcript(project_dir: str) -> str | None:
     """Find the most recent transcript file for a project.
 
@@ -55,17 +261,16 @@ def find_recent_transcript(project_dir: str) -> str | None:
 
     # The project path gets encoded with dashes replacing slashes
     project_path_encoded = project_dir.replace("/", "-")
-    claude_projects_dir = os.path.expanduser("~/.claude/projects")
-
-    if not os.path.exists(claude_projects_dir):
+    try:
+        projects = _scan_dir_cached(CLAUDE_PROJECTS_DIR)
+    except (IOError, OSError):
         return None
 
-    matching_dirs = []
-    for name in os.listdir(claude_projects_dir):
-        if project_path_encoded in name or name == project_path_encoded:
-            full_path = os.path.join(claude_projects_dir, name)
-            if os.path.isdir(full_path):
-                matching_dirs.append(full_path)
+    matching_dirs = [
+        entry.path
+        for entry in projects
+        if entry.is_dir and project_path_encoded in entry.name
+    ]
 
     # Find the most recent .jsonl file across all matching directories
     newest_file = None
@@ -73,19 +278,106 @@ def find_recent_transcript(project_dir: str) -> str | None:
 
     for dir_path in matching_dirs:
         try:
-            for filename in os.listdir(dir_path):
-                if filename.endswith(".jsonl"):
-                    file_path = os.path.join(dir_path, filename)
-                    mtime = os.path.getmtime(file_path)
-                    if mtime > newest_mtime:
-                        newest_mtime = mtime
-                        newest_file = file_path
+            entries = _scan_dir_cached(dir_path)
         except (IOError, OSError):
             continue
+        for entry in entries:
+            if entry.name.endswith(".jsonl"):
+                try:
+                    mtime = os.stat(entry.path).st_mtime
+                except (IOError, OSError):
+                    continue
+                if mtime > newest_mtime:
+                    newest_mtime = mtime
+                    newest_file = entry.path
 
     return newest_file
 
 
+def _handle_text_block(block: dict, info: MessageInfo, text_parts: list[str]) -> None:
+    text_parts.append(block.get("text", ""))
+
+
+def _handle_tool_use_block(
+    block: dict, info: MessageInfo, text_parts: list[str]
+) -> None:
+    tool_name = block.get("name", "")
+    info.tool_names.append(tool_name)
+    info.last_tool_name = tool_name
+
+    if tool_name == "AskUserQuestion":
+        info.ask_user_question_input = block.get("input", {})
+
+
+# Content block type -> handler(block, info, text_parts). Other block types
+# (thinking, tool_result, ...) carry nothing we report.
+_BLOCK_HANDLERS: dict[str, Callable[[dict, MessageInfo, list[str]], None]] = {
+    "text": _handle_text_block,
+    "tool_use": _handle_tool_use_block,
+}
+
+
+def _message_info_from_entry(entry: dict) -> MessageInfo:
+    """Extract MessageInfo from one assistant transcript entry.
+
+    Args:
+        entry: Parsed JSONL entry with type "assistant"
+
+    Returns:
+        MessageInfo for the entry's message
+    """
+    message = entry.get("message", {})
+    content = message.get("content", [])
+
+    info = MessageInfo()
+    text_parts: list[str] = []
+    last_block_type: str | None = None
+    # Bound once so the per-block loop avoids repeated attribute lookups
+    get_handler = _BLOCK_HANDLERS.get
+    add_text = text_parts.append
+
+    for block in content:
+        block_cls = type(block)
+        if block_cls is dict:
+            last_block_type = block.get("type")
+            handler = get_handler(last_block_type)
+            if handler is not None:
+                handler(block, info, text_parts)
+        elif block_cls is str:
+            add_text(block)
+            last_block_type = "text"
+
+    if text_parts:
+        info.text = " ".join(text_parts)
+    info.ends_with_tool_use = last_block_type == "tool_use"
+    return info
+
+
+def _iter_jsonl_lines(f: BinaryIO, chunk_size: int = JSONL_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of a binary file, reading it in fixed-size chunks.
+
+    Complete lines keep their trailing newline; a final line without one is
+    yielded as-is, so callers can tell a line that is still being written.
+
+    Args:
+        f: File opened in binary mode, positioned where scanning starts
+        chunk_size: Bytes to read per chunk
+
+    Yields:
+        Lines as bytes
+    """
+    buf = b""
+    while chunk := f.read(chunk_size):
+        buf = buf + chunk if buf else chunk
+        start = 0
+        while (newline := buf.find(b"\n", start)) != -1:
+            yield buf[start : newline + 1]
+            start = newline + 1
+        buf = buf[start:]
+    if buf:
+        yield buf
+
+
 def read_transcript(transcript_path: str | Path | None) -> MessageInfo | None:
     """Read JSONL transcript and return the last assistant message info.
 
@@ -95,56 +387,186 @@ def read_transcript(transcript_path: str | Path | None) -> MessageInfo | None:
     Returns:
         MessageInfo with extracted data, or None if not found
     """
-    if not transcript_path or not os.path.exists(transcript_path):
-        return None
+    return read_transcript_info(transcript_path).last
+
+
+@dataclass
+class _ScanState:
+    """Parse progress for one transcript, so later scans only read the new tail."""
 
+    offset: int = 0
+    last_line: bytes = b""
     last_info: MessageInfo | None = None
+    last_text: str | None = None
+
+
+# Transcript path -> parse progress. JSONL transcripts are append-only, so
+# each scan resumes from the end of the last complete line it consumed.
+_scan_states: dict[str, _ScanState] = {}
+
 
+_ASSISTANT_MARKER = b'"assistant"'
+
+
+def _parse_assistant_line(line: bytes) -> MessageInfo | None:
+    """Parse one JSONL line, returning MessageInfo if it is an assistant entry."""
+    # Only assistant entries are needed, and their "type" value always
+    # contains this literal, so user and tool-result lines (often the largest
+    # in the file) are skipped without being decoded into dicts
+    if _ASSISTANT_MARKER not in line:
+        return None
     try:
-        with open(transcript_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                    if entry.get("type") == "assistant":
-                        message = entry.get("message", {})
-                        content = message.get("content", [])
-
-                        info = MessageInfo()
-                        text_parts: list[str] = []
-                        last_block_type: str | None = None
-
-                        for block in content:
-                            if isinstance(block, dict):
-                                block_type = block.get("type")
-                                last_block_type = block_type
-
-                                if block_type == "text":
-                                    text_parts.append(block.get("text", ""))
-                                elif block_type == "tool_use":
-                                    tool_name = block.get("name", "")
-                                    info.tool_names.append(tool_name)
-                                    info.last_tool_name = tool_name
-
-                                    if tool_name == "AskUserQuestion":
-                                        info.ask_user_question_input = block.get("input", {})
-                            elif isinstance(block, str):
-                                text_parts.append(block)
-                                last_block_type = "text"
-
-                        if text_parts:
-                            info.text = " ".join(text_parts)
-                        info.ends_with_tool_use = last_block_type == "tool_use"
-
-                        last_info = info
-                except json.JSONDecodeError:
-                    continue
-    except (IOError, OSError):
+        # orjson's JSONDecodeError subclasses json's, and it also covers
+        # invalid UTF-8
+        entry = orjson.loads(line) if orjson is not None else json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         return None
+    if isinstance(entry, dict) and entry.get("type") == "assistant":
+        return _message_info_from_entry(entry)
+    return None
+
+
+def _apply_line(state: _ScanState, line: bytes) -> None:
+    """Fold one JSONL line into the scan state."""
+    info = _parse_assistant_line(line)
+    if info is not None:
+        state.last_info = info
+        if info.text is not None:
+            state.last_text = info.text
+
 
-    return last_info
+def _iter_lines_reverse(f: BinaryIO, end: int, chunk_size: int = JSONL_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of a binary file from the end backward, like ``tail``.
+
+    The first line yielded is whatever follows the last newline (empty if
+    the file ends with one). Lines are yielded without their newline.
+
+    Args:
+        f: File opened in binary mode
+        end: Offset to scan backward from (usually the file size)
+        chunk_size: Bytes to read per chunk
+
+    Yields:
+        Lines as bytes, last line first
+    """
+    pos = end
+    carry = b""
+    while pos > 0:
+        read_size = min(chunk_size, pos)
+        pos -= read_size
+        f.seek(pos)
+        lines = (f.read(read_size) + carry).split(b"\n")
+        carry = lines[0]
+        yield from reversed(lines[1:])
+    yield carry
+
+
+def _scan_backward(f: BinaryIO, size: int) -> tuple[_ScanState, bytes]:
+    """Build scan state by reading a transcript from the end.
+
+    Stops at the most recent assistant message that has text, so only the
+    end of a long transcript is parsed.
+
+    Args:
+        f: Transcript opened in binary mode
+        size: Transcript size in bytes
+
+    Returns:
+        Tuple of (scan state positioned after the last complete line,
+        trailing bytes after the last newline)
+    """
+    state = _ScanState()
+    lines = _iter_lines_reverse(f, size)
+    tail = next(lines)
+    state.offset = size - len(tail)
+
+    for line in lines:
+        if not state.last_line:
+            state.last_line = line + b"\n"
+        info = _parse_assistant_line(line)
+        if info is None:
+            continue
+        if state.last_info is None:
+            state.last_info = info
+        if info.text is not None:
+            state.last_text = info.text
+            break
+
+    return state, tail
+
+
+def _resume_offset(f, state: _ScanState, size: int) -> bool:
+    """Check that the previously consumed prefix is still in place.
+
+    Args:
+        f: Transcript opened in binary mode
+        state: Saved scan state for the transcript
+        size: Current transcript size in bytes
+
+    Returns:
+        True if scanning can resume at state.offset, False if the file was
+        truncated or rewritten and must be scanned afresh
+    """
+    if size < state.offset:
+        return False
+    f.seek(state.offset - len(state.last_line))
+    return f.read(len(state.last_line)) == state.last_line
+
+
+def read_transcript_info(transcript_path: str | Path | None) -> TranscriptInfo:
+    """Read a JSONL transcript, collecting what both readers need.
+
+    read_transcript() and read_last_assistant_text() are thin wrappers
+    around this; callers needing both fields should call it once.
+    The first scan reads backward from the end and stops at the last
+    assistant message with text. The byte offset of the last complete line
+    is remembered per path, so repeat scans of a growing transcript only
+    parse the appended lines. A truncated or rewritten file is detected and
+    scanned afresh.
+
+    Args:
+        transcript_path: Path to the transcript JSONL file
+
+    Returns:
+        TranscriptInfo; both fields are None if the file is missing or unreadable
+    """
+    if not transcript_path:
+        return TranscriptInfo()
+
+    key = str(transcript_path)
+    state = _scan_states.get(key)
+
+    # Only complete lines advance the saved offset; a trailing line that is
+    # still being written is parsed for this result but re-read next time.
+    # A missing file surfaces as FileNotFoundError from open(), saving a
+    # separate existence check.
+    tail = b""
+    try:
+        with open(transcript_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if state is None or not _resume_offset(f, state, size):
+                # First scan: the answer is near the end, so read backward
+                state, tail = _scan_backward(f, size)
+            else:
+                f.seek(state.offset)
+                for line in _iter_jsonl_lines(f):
+                    if not line.endswith(b"\n"):
+                        tail = line
+                        break
+                    _apply_line(state, line)
+                    state.offset += len(line)
+                    state.last_line = line
+    except (IOError, OSError):
+        _scan_states.pop(key, None)
+        return TranscriptInfo()
+    _scan_states[key] = state
+
+    if tail.strip():
+        pending = _ScanState(last_info=state.last_info, last_text=state.last_text)
+        _apply_line(pending, tail)
+        return TranscriptInfo(pending.last_info, pending.last_text)
+
+    return TranscriptInfo(state.last_info, state.last_text)
 
 
 def read_last_assistant_text(transcript_path: str | Path | None) -> str | None:
@@ -160,37 +582,7 @@ def read_last_assistant_text(transcript_path: str | Path | None) -> str | None:
     Returns:
         The text content, or None if no assistant message with text was found
     """
-    if not transcript_path or not os.path.exists(transcript_path):
-        return None
-
-    last_text: str | None = None
-
-    try:
-        with open(transcript_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                    if entry.get("type") == "assistant":
-                        content = entry.get("message", {}).get("content", [])
-                        text_parts: list[str] = []
-
-                        for block in content:
-                            if isinstance(block, dict) and block.get("type") == "text":
-                                text_parts.append(block.get("text", ""))
-                            elif isinstance(block, str):
-                                text_parts.append(block)
-
-                        if text_parts:
-                            last_text = " ".join(text_parts)
-                except json.JSONDecodeError:
-                    continue
-    except (IOError, OSError):
-        return None
-
-    return last_text
+    return read_transcript_info(transcript_path).last_text
 
 
 def get_transcript_path(
@@ -210,13 +602,10 @@ def get_transcript_path(
     """
     transcript_path = hook_data.get("transcript_path")
 
-    # Try the provided path first
-    if transcript_path:
-        if os.path.exists(transcript_path):
-            return transcript_path, False
-        # Wait for file to appear (race condition handling)
-        if wait_for_file(transcript_path, timeout=wait_timeout):
-            return transcript_path, False
+    # Try the provided path first; wait_for_file() returns at once if it
+    # already exists, else waits for it to appear (race condition handling)
+    if transcript_path and wait_for_file(transcript_path, timeout=wait_timeout):
+        return transcript_path, False
 
     # Fallback to searching for recent transcripts
     fallback_path = find_recent_transcript(project_dir)
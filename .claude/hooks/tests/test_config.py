@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# /// script
+# requires-python = ">=3.11"
+# dependencies = ["pytest", "pyyaml"]
+# ///
+"""Tests for config loading and the generated config module cache."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from lib.config import PermissionRequestHookConfig, _compile_template, _get_compiled_path, load_config
+
+CONFIG_YAML = """\
+global:
+  debug: false
+  debug_dir: "Temp"
+  project_dir: "/tmp/project"
+
+hooks:
+  stop:
+    enabled: true
+    voice:
+      name: "Daniel"
+      rate: 300
+    summary:
+      max_sentences: 3
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Write a config.yaml into a temporary directory."""
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG_YAML)
+    return path
+
+
+def bump_mtime(path):
+    """Move the file's mtime forward so the cache key changes."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestLoadConfig:
+    def test_parses_yaml(self, config_path):
+        config = load_config(config_path)
+        assert config.global_config.debug is False
+        assert config.stop.voice.name == "Daniel"
+        assert config.stop.voice.rate == 300
+        assert config.stop.summary.max_sentences == 3
+        # Unspecified nested settings keep their defaults
+        assert config.stop.sound.enabled is True
+
+    def test_missing_file_returns_defaults(self, tmp_path):
+        config = load_config(tmp_path / "nope.yaml")
+        assert config.stop.enabled is True
+
+
+class TestConfigCache:
+    def test_writes_cache(self, config_path):
+        load_config(config_path)
+        assert _get_compiled_path(config_path).exists()
+
+    def test_cache_hit_skips_yaml(self, config_path):
+        load_config(config_path)
+        with patch("yaml.safe_load", side_effect=AssertionError("parsed YAML")):
+            config = load_config(config_path)
+        assert config.stop.voice.name == "Daniel"
+
+    def test_yaml_change_invalidates_cache(self, config_path):
+        load_config(config_path)
+        config_path.write_text(CONFIG_YAML.replace("Daniel", "Samantha"))
+        bump_mtime(config_path)
+        config = load_config(config_path)
+        assert config.stop.voice.name == "Samantha"
+
+    def test_corrupted_cache_falls_back_to_yaml(self, config_path):
+        _get_compiled_path(config_path).write_text("garbage(")
+        config = load_config(config_path)
+        assert config.stop.voice.name == "Daniel"
+
+    def test_compiled_config_matches_yaml(self, config_path):
+        fresh = load_config(config_path)
+        compiled = load_config(config_path)
+        assert compiled == fresh
+        assert compiled is not fresh
+
+    def test_env_overrides_not_cached(self, config_path, monkeypatch):
+        monkeypatch.setenv("HOOK_DEBUG", "1")
+        assert load_config(config_path).global_config.debug is True
+        monkeypatch.delenv("HOOK_DEBUG")
+        assert load_config(config_path).global_config.debug is False
+
+
+class TestCompileTemplate:
+    @pytest.mark.parametrize("template", [
+        "Approve {tool_name}?",
+        "{tool_name} failed",
+        "No fields at all",
+        "Escaped {{braces}} and {tool_name!r:>8} with 'quotes\" and \\ slash",
+    ])
+    def test_matches_str_format(self, template):
+        assert _compile_template(template)(tool_name="Bash") == template.format(tool_name="Bash")
+
+    @pytest.mark.parametrize("template", ["Done {_}", "{class} {_} {_}"])
+    def test_any_identifier_field(self, template):
+        fields = {"_": "x", "class": "y"}
+        assert _compile_template(template)(**fields) == template.format(**fields)
+
+    def test_missing_field_raises_key_error(self):
+        with pytest.raises(KeyError):
+            _compile_template("Approve {tool_name}?")()
+
+    def test_unsupported_fields_fall_back_to_format(self):
+        assert _compile_template("{0} failed") == "{0} failed".format
+
+    def test_hook_config_sets_format_message(self):
+        config = PermissionRequestHookConfig(message_template="Allow {tool_name}?")
+        assert config.format_message(tool_name="Read") == "Allow Read?"
+
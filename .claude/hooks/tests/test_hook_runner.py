@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# /// script
+# requires-python = ">=3.11"
+# dependencies = ["pytest", "pyyaml"]
+# ///
+"""Tests for the hook runner entrypoint and hook JSON parsing."""
+
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import hook_runner
+from lib.config import Config
+from lib.handlers.ask_user import AskUserQuestionHandler
+from lib.hook_input import parse_hook_json
+
+
+class TestParseHookJson:
+    def test_object(self):
+        assert parse_hook_json(b'{"hook_event_name": "Stop"}') == {"hook_event_name": "Stop"}
+
+    def test_empty(self):
+        assert parse_hook_json(b"") == {}
+
+    def test_malformed(self):
+        assert parse_hook_json(b"{not json") == {}
+
+    def test_stdlib_fallback(self):
+        with patch("lib.hook_input.orjson", None):
+            assert parse_hook_json(b'{"a": 1}') == {"a": 1}
+            assert parse_hook_json(b"{not json") == {}
+
+
+class TestEventFromArgv:
+    @pytest.mark.parametrize(("argv", "expected"), [
+        (["--event", "Stop"], "Stop"),
+        (["--event=PostToolUse"], "PostToolUse"),
+        (["-v", "--event", "Notification", "extra"], "Notification"),
+        (["--event"], None),
+        ([], None),
+        (["--events=Stop"], None),
+    ])
+    def test_parse(self, argv, expected):
+        assert hook_runner._event_from_argv(argv) == expected
+
+
+@pytest.fixture
+def run_main(monkeypatch):
+    """Run hook_runner.main() in-process with the given argv and stdin body."""
+    monkeypatch.setenv("HOOK_FOREGROUND", "1")
+    monkeypatch.setattr(hook_runner, "load_config", lambda path: Config())
+
+    def run(argv, body):
+        raw = json.dumps(body).encode()
+        monkeypatch.setattr(hook_runner.sys, "argv", ["hook_runner.py", *argv])
+        monkeypatch.setattr(hook_runner.sys, "stdin", SimpleNamespace(buffer=io.BytesIO(raw)))
+        hook_runner.main()
+
+    return run
+
+
+class TestDispatch:
+    @pytest.fixture
+    def messages(self, monkeypatch):
+        """Record get_message calls on AskUserQuestionHandler, without audio."""
+        seen = []
+
+        def get_message(handler, data):
+            seen.append(data)
+            return None
+
+        monkeypatch.setattr(AskUserQuestionHandler, "get_message", get_message)
+        return seen
+
+    def test_event_flag_streams_body_to_handler(self, run_main, messages):
+        with patch.object(
+            AskUserQuestionHandler, "handle_stream", autospec=True,
+            side_effect=AskUserQuestionHandler.handle_stream,
+        ) as handle_stream:
+            run_main(["--event", "PostToolUse"], {"tool_name": "AskUserQuestion"})
+        handle_stream.assert_called_once()
+        assert [d["tool_name"] for d in messages] == ["AskUserQuestion"]
+
+    def test_event_flag_other_tool_rejected_by_should_handle(self, run_main, messages):
+        # The runner cannot filter PostToolUse by tool without parsing the
+        # body, so the handler's should_handle() has to reject it
+        with patch.object(
+            AskUserQuestionHandler, "should_handle", autospec=True,
+            side_effect=AskUserQuestionHandler.should_handle,
+        ) as should_handle:
+            run_main(["--event=PostToolUse"], {"tool_name": "Bash"})
+        should_handle.assert_called_once()
+        assert messages == []
+
+    def test_event_from_body_filters_other_tools(self, run_main, messages):
+        with patch.object(AskUserQuestionHandler, "handle_stream") as handle_stream:
+            run_main([], {"hook_event_name": "PostToolUse", "tool_name": "Bash"})
+        handle_stream.assert_not_called()
+        assert messages == []
+
+    def test_event_from_body_dispatches(self, run_main, messages):
+        run_main([], {"hook_event_name": "PostToolUse", "tool_name": "AskUserQuestion"})
+        assert [d["tool_name"] for d in messages] == ["AskUserQuestion"]
+
+    def test_disabled_event_never_parses_body(self, run_main, monkeypatch):
+        config = Config()
+        config.ask_user_question.enabled = False
+        monkeypatch.setattr(hook_runner, "load_config", lambda path: config)
+        with patch("lib.hook_input.orjson") as orjson, patch("lib.hook_input.json") as stdlib_json:
+            run_main(["--event", "PostToolUse"], {"tool_name": "AskUserQuestion"})
+        orjson.loads.assert_not_called()
+        stdlib_json.loads.assert_not_called()
@@ -6,6 +6,7 @@
 """Tests for dedup state management."""
 
 import json
+import os
 import time
 from pathlib import Path
 from unittest.mock import patch
@@ -16,7 +17,9 @@ from lib.state import (
     STATE_EXPIRY_SECONDS,
     cleanup_stale_states,
     clear_state,
+    get_handled,
     mark_handled,
+    mark_handled_many,
     set_last_spoken,
     was_already_spoken,
     was_handled,
@@ -63,6 +66,62 @@ class TestMarkAndWasHandled:
             assert not was_handled("sess1", "ask_user", state_dir=state_dir)
 
 
+class TestGetHandled:
+    def test_none_handled(self, state_dir):
+        assert get_handled("sess1", state_dir=state_dir) == set()
+
+    def test_returns_all_handled(self, state_dir):
+        mark_handled("sess1", "permission", state_dir=state_dir)
+        mark_handled("sess1", "ask_user", state_dir=state_dir)
+        assert get_handled("sess1", state_dir=state_dir) == {"ask_user", "permission"}
+
+    def test_session_isolation(self, state_dir):
+        mark_handled("sess1", "tool_failure", state_dir=state_dir)
+        assert get_handled("sess2", state_dir=state_dir) == set()
+
+
+class TestMarkHandledMany:
+    def test_marks_all(self, state_dir):
+        mark_handled_many("sess1", ("tool_failure", "subagent_stop"), state_dir=state_dir)
+        assert get_handled("sess1", state_dir=state_dir) == {"tool_failure", "subagent_stop"}
+
+    def test_keeps_existing(self, state_dir):
+        mark_handled("sess1", "ask_user", state_dir=state_dir)
+        mark_handled_many("sess1", ("ask_user", "permission"), state_dir=state_dir)
+        state_file = Path(state_dir) / ".hook_state_sess1.json"
+        assert json.loads(state_file.read_text())["handled"] == ["ask_user", "permission"]
+
+
+class TestStateCache:
+    def test_unchanged_file_not_reparsed(self, state_dir):
+        mark_handled("sess1", "ask_user", state_dir=state_dir)
+        with patch("lib.state._parse_state", side_effect=AssertionError("reparsed")):
+            assert was_handled("sess1", "ask_user", state_dir=state_dir)
+            assert not was_handled("sess1", "permission", state_dir=state_dir)
+
+    def test_external_write_picked_up(self, state_dir):
+        mark_handled("sess1", "ask_user", state_dir=state_dir)
+        state_file = Path(state_dir) / ".hook_state_sess1.json"
+        state_file.write_text(json.dumps({"handled": ["permission", "tool_failure"], "timestamp": time.time()}))
+        assert was_handled("sess1", "permission", state_dir=state_dir)
+        assert not was_handled("sess1", "ask_user", state_dir=state_dir)
+
+    def test_no_temp_files_left(self, state_dir):
+        mark_handled("sess1", "ask_user", state_dir=state_dir)
+        set_last_spoken("sess1", "Hello", state_dir=state_dir)
+        assert [p.name for p in Path(state_dir).iterdir()] == [".hook_state_sess1.json"]
+
+
+class TestAtomicSave:
+    def test_failed_write_keeps_previous_state(self, state_dir):
+        mark_handled("sess1", "ask_user", state_dir=state_dir)
+        with patch("lib.state.os.replace", side_effect=OSError("killed")):
+            mark_handled("sess1", "permission", state_dir=state_dir)
+        assert was_handled("sess1", "ask_user", state_dir=state_dir)
+        assert not was_handled("sess1", "permission", state_dir=state_dir)
+        assert [p.name for p in Path(state_dir).iterdir()] == [".hook_state_sess1.json"]
+
+
 class TestLastSpoken:
     def test_roundtrip(self, state_dir):
         set_last_spoken("sess1", "Hello world", state_dir=state_dir)
@@ -75,6 +134,17 @@ class TestLastSpoken:
     def test_no_prior_spoken(self, state_dir):
         assert not was_already_spoken("sess1", "anything", state_dir=state_dir)
 
+    def test_long_message_roundtrip(self, state_dir):
+        long_message = "word " * 100
+        set_last_spoken("sess1", long_message, state_dir=state_dir)
+        assert was_already_spoken("sess1", long_message, state_dir=state_dir)
+        assert not was_already_spoken("sess1", long_message + "more", state_dir=state_dir)
+
+    def test_long_message_stored_hashed(self, state_dir):
+        set_last_spoken("sess1", "x" * 1000, state_dir=state_dir)
+        state_file = Path(state_dir) / ".hook_state_sess1.json"
+        assert len(json.loads(state_file.read_text())["last_spoken"]) < 100
+
     def test_session_isolation(self, state_dir):
         set_last_spoken("sess1", "Hello", state_dir=state_dir)
         assert not was_already_spoken("sess2", "Hello", state_dir=state_dir)
@@ -111,11 +181,10 @@ class TestCorruptedState:
 class TestCleanupStaleStates:
     def test_removes_expired(self, state_dir):
         mark_handled("sess1", "ask_user", state_dir=state_dir)
-        # Manually backdate the timestamp
+        # Manually backdate the file
         state_file = Path(state_dir) / ".hook_state_sess1.json"
-        data = json.loads(state_file.read_text())
-        data["timestamp"] = time.time() - STATE_EXPIRY_SECONDS - 10
-        state_file.write_text(json.dumps(data))
+        stale = time.time() - STATE_EXPIRY_SECONDS - 10
+        os.utime(state_file, (stale, stale))
 
         cleanup_stale_states(state_dir=state_dir)
         assert not state_file.exists()
@@ -125,12 +194,30 @@ class TestCleanupStaleStates:
         cleanup_stale_states(state_dir=state_dir)
         assert was_handled("sess1", "ask_user", state_dir=state_dir)
 
-    def test_removes_corrupted(self, state_dir):
+    def test_removes_stale_corrupted(self, state_dir):
         state_file = Path(state_dir) / ".hook_state_bad.json"
         state_file.write_text("corrupted{{{")
+        stale = time.time() - STATE_EXPIRY_SECONDS - 10
+        os.utime(state_file, (stale, stale))
         cleanup_stale_states(state_dir=state_dir)
         assert not state_file.exists()
 
+    def test_removes_stale_temp_files(self, state_dir):
+        tmp_file = Path(state_dir) / ".hook_state_sess1.json.abc123.tmp"
+        tmp_file.write_text('{"handled": [')
+        stale = time.time() - STATE_EXPIRY_SECONDS - 10
+        os.utime(tmp_file, (stale, stale))
+        cleanup_stale_states(state_dir=state_dir)
+        assert not tmp_file.exists()
+
+    def test_ignores_other_files(self, state_dir):
+        other = Path(state_dir) / "unrelated.json"
+        other.write_text("{}")
+        stale = time.time() - STATE_EXPIRY_SECONDS - 10
+        os.utime(other, (stale, stale))
+        cleanup_stale_states(state_dir=state_dir)
+        assert other.exists()
+
     def test_nonexistent_dir(self, tmp_path):
         nonexistent = str(tmp_path / "nope")
         # Should not raise
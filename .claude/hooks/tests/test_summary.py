@@ -9,13 +9,30 @@ import pytest
 
 from lib.summary import (
     SummaryConfig,
+    _iter_sentences,
+    ends_with_question,
     extract_last_question,
     extract_summary,
+    extract_summary_and_question,
     find_action_start,
     split_sentences,
 )
 
 
+class TestEndsWithQuestion:
+    @pytest.mark.parametrize("text", [
+        "Ready?",
+        "Ready?  \n",
+        "Done.",
+        "Done. ",
+        "?",
+        "",
+        "   ",
+    ])
+    def test_matches_strip_endswith(self, text):
+        assert ends_with_question(text) == text.strip().endswith("?")
+
+
 class TestSplitSentences:
     def test_basic(self):
         assert split_sentences("Hello. World.") == ["Hello.", "World."]
@@ -31,6 +48,18 @@ class TestSplitSentences:
         assert split_sentences("No ending punctuation") == ["No ending punctuation"]
 
 
+class TestIterSentences:
+    @pytest.mark.parametrize("text", [
+        "Hello. World.",
+        "What? Yes!  Done.",
+        "No ending punctuation",
+        "Trailing space. ",
+        "",
+    ])
+    def test_matches_split_sentences(self, text):
+        assert list(_iter_sentences(text)) == split_sentences(text)
+
+
 class TestFindActionStart:
     def test_finds_action_verb(self):
         sentences = ["Here is context.", "I've Created the file.", "Done."]
@@ -51,6 +80,10 @@ class TestFindActionStart:
         sentences = ["created the file."]
         assert find_action_start(sentences) == 0  # lowercase 'created' matches via IGNORECASE
 
+    def test_leading_whitespace(self):
+        sentences = ["Some preamble.", "  \n Fixed the bug."]
+        assert find_action_start(sentences) == 1
+
 
 class TestExtractSummary:
     def test_empty_text(self):
@@ -119,3 +152,21 @@ class TestExtractLastQuestion:
     def test_empty(self):
         assert extract_last_question(None) is None
         assert extract_last_question("") is None
+
+
+class TestExtractSummaryAndQuestion:
+    @pytest.mark.parametrize("text", [
+        "I fixed the bug. Want me to push?",
+        "Should I continue?",
+        "Done. Any questions? Let me know.",
+        "No question here.",
+    ])
+    def test_matches_separate_calls(self, text):
+        config = SummaryConfig()
+        assert extract_summary_and_question(text, config) == (
+            extract_summary(text, config),
+            extract_last_question(text),
+        )
+
+    def test_empty(self):
+        assert extract_summary_and_question("") == ("Task completed", None)
@@ -6,10 +6,28 @@
 """Tests for transcript JSONL parsing."""
 
 import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from unittest.mock import patch
 
 import pytest
 
-from lib.transcript import MessageInfo, read_last_assistant_text, read_transcript
+from lib.transcript import (
+    MessageInfo,
+    TranscriptInfo,
+    _iter_jsonl_lines,
+    _iter_lines_reverse,
+    _parse_assistant_line,
+    _wait_with_inotify,
+    find_recent_transcript,
+    read_last_assistant_text,
+    read_transcript,
+    read_transcript_info,
+    wait_for_file,
+)
 
 
 def write_jsonl(path, entries):
@@ -103,6 +121,144 @@ class TestReadTranscript:
         info = read_transcript(str(path))
         assert info.text == "plain string text"
 
+    def test_unhandled_block_type_is_last_block(self, tmp_path):
+        """Block types without a handler still count as the last block."""
+        path = tmp_path / "transcript.jsonl"
+        entry = {"type": "assistant", "message": {"content": [
+            {"type": "tool_use", "name": "Bash"},
+            {"type": "thinking", "thinking": "hmm"},
+        ]}}
+        write_jsonl(path, [entry])
+        info = read_transcript(str(path))
+        assert info.tool_names == ["Bash"]
+        assert info.text is None
+        assert info.ends_with_tool_use is False
+
+
+class TestParseAssistantLine:
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_parses_with_and_without_orjson(self, use_orjson):
+        line = json.dumps(make_assistant_entry(text="Hi")).encode()
+        with nullcontext() if use_orjson else patch("lib.transcript.orjson", None):
+            assert _parse_assistant_line(line).text == "Hi"
+            assert _parse_assistant_line(b"{bad") is None
+            assert _parse_assistant_line(b'"\xff"') is None
+            assert _parse_assistant_line(b'{"type": "user"}') is None
+
+    def test_non_assistant_line_not_decoded(self):
+        line = json.dumps({"type": "user", "message": {"content": "x" * 1000}}).encode()
+        with patch("lib.transcript.orjson", None), \
+                patch("lib.transcript.json.loads") as loads:
+            assert _parse_assistant_line(line) is None
+        loads.assert_not_called()
+
+
+class TestIterJsonlLines:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 65536])
+    def test_lines_across_chunks(self, tmp_path, chunk_size):
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b'{"a": 1}\n\n{"b": 2}\npartial')
+        with open(path, "rb") as f:
+            lines = list(_iter_jsonl_lines(f, chunk_size=chunk_size))
+        assert lines == [b'{"a": 1}\n', b"\n", b'{"b": 2}\n', b"partial"]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.jsonl"
+        path.write_bytes(b"")
+        with open(path, "rb") as f:
+            assert list(_iter_jsonl_lines(f)) == []
+
+
+class TestIterLinesReverse:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 65536])
+    @pytest.mark.parametrize("data", [
+        b'{"a": 1}\n\n{"b": 2}\npartial',
+        b'{"a": 1}\n{"b": 2}\n',
+        b"no newline",
+        b"",
+    ])
+    def test_matches_split(self, tmp_path, chunk_size, data):
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(data)
+        with open(path, "rb") as f:
+            lines = list(_iter_lines_reverse(f, len(data), chunk_size=chunk_size))
+        assert lines == list(reversed(data.split(b"\n")))
+
+
+class TestReadTranscriptInfoBackward:
+    def test_stops_at_last_text(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        write_jsonl(path, [make_assistant_entry(text=f"Message {i}") for i in range(50)] + [
+            make_assistant_entry(tools=["Bash"]),
+        ])
+        with patch(
+            "lib.transcript._parse_assistant_line", wraps=_parse_assistant_line
+        ) as parse:
+            result = read_transcript_info(str(path))
+        info, text = result.last, result.last_text
+        assert info.tool_names == ["Bash"]
+        assert text == "Message 49"
+        assert parse.call_count == 2
+
+    def test_skips_non_assistant_and_malformed(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        write_jsonl(path, [make_assistant_entry(text="Answer"), {"type": "user"}])
+        with open(path, "a") as f:
+            f.write("not json\n")
+        result = read_transcript_info(str(path))
+        info, text = result.last, result.last_text
+        assert info.text == "Answer"
+        assert text == "Answer"
+
+
+class TestReadTranscriptInfoIncremental:
+    def test_appended_lines_parsed(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        write_jsonl(path, [make_assistant_entry(text="First")])
+        assert read_transcript_info(str(path)).last.text == "First"
+        with open(path, "a") as f:
+            f.write(json.dumps(make_assistant_entry(tools=["Bash"])) + "\n")
+        result = read_transcript_info(str(path))
+        info, text = result.last, result.last_text
+        assert info.tool_names == ["Bash"]
+        assert text == "First"
+
+    def test_only_tail_reparsed(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        write_jsonl(path, [make_assistant_entry(text="First")])
+        read_transcript_info(str(path))
+        with open(path, "a") as f:
+            f.write(json.dumps(make_assistant_entry(text="Second")) + "\n")
+        with patch(
+            "lib.transcript._parse_assistant_line", wraps=_parse_assistant_line
+        ) as parse:
+            assert read_transcript_info(str(path)).last_text == "Second"
+        assert parse.call_count == 1
+
+    def test_rewritten_file_rescanned(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        write_jsonl(path, [make_assistant_entry(text="Old")])
+        read_transcript_info(str(path))
+        write_jsonl(path, [make_assistant_entry(text="Replaced"), make_assistant_entry(text="New")])
+        assert read_transcript_info(str(path)).last_text == "New"
+
+    def test_truncated_file_rescanned(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        write_jsonl(path, [make_assistant_entry(text="One"), make_assistant_entry(text="Two")])
+        read_transcript_info(str(path))
+        path.write_text("")
+        assert read_transcript_info(str(path)) == TranscriptInfo()
+
+    def test_partial_last_line(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        write_jsonl(path, [make_assistant_entry(text="Done")])
+        with open(path, "a") as f:
+            f.write('{"type": "assistant", "mess')
+        assert read_transcript_info(str(path)).last_text == "Done"
+        with open(path, "a") as f:
+            f.write('age": {"content": ["Finished"]}}\n')
+        assert read_transcript_info(str(path)).last_text == "Finished"
+
 
 class TestReadLastAssistantText:
     def test_basic(self, tmp_path):
@@ -129,3 +285,110 @@ class TestReadLastAssistantText:
 
     def test_nonexistent(self):
         assert read_last_assistant_text("/no/such/file.jsonl") is None
+
+
+class TestFindRecentTranscript:
+    @pytest.fixture
+    def projects_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "lib.transcript.CLAUDE_PROJECTS_DIR", str(tmp_path / ".claude" / "projects")
+        )
+        d = tmp_path / ".claude" / "projects" / "-work-myproj"
+        d.mkdir(parents=True)
+        return d
+
+    def test_newest_file(self, projects_dir):
+        old = projects_dir / "old.jsonl"
+        new = projects_dir / "new.jsonl"
+        old.write_text("")
+        new.write_text("")
+        os.utime(old, (1000, 1000))
+        assert find_recent_transcript("/work/myproj") == str(new)
+
+    def test_new_file_after_cached_listing(self, projects_dir):
+        first = projects_dir / "first.jsonl"
+        first.write_text("")
+        os.utime(first, (1000, 1000))
+        assert find_recent_transcript("/work/myproj") == str(first)
+        second = projects_dir / "second.jsonl"
+        second.write_text("")
+        assert find_recent_transcript("/work/myproj") == str(second)
+
+    def test_appended_file_becomes_newest(self, projects_dir):
+        a = projects_dir / "a.jsonl"
+        b = projects_dir / "b.jsonl"
+        a.write_text("")
+        b.write_text("")
+        os.utime(a, (1000, 1000))
+        assert find_recent_transcript("/work/myproj") == str(b)
+        os.utime(a, (time.time() + 10, time.time() + 10))
+        assert find_recent_transcript("/work/myproj") == str(a)
+
+    def test_settled_listing_reused(self, projects_dir):
+        (projects_dir / "a.jsonl").write_text("")
+        old = time.time() - 60
+        os.utime(projects_dir, (old, old))
+        os.utime(projects_dir.parent, (old, old))
+        find_recent_transcript("/work/myproj")
+        with patch("lib.transcript.os.scandir", side_effect=AssertionError("relisted")):
+            assert find_recent_transcript("/work/myproj") == str(projects_dir / "a.jsonl")
+
+    def test_no_projects_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("lib.transcript.CLAUDE_PROJECTS_DIR", str(tmp_path / "nope"))
+        assert find_recent_transcript("/work/myproj") is None
+
+
+class TestWaitForFile:
+    def test_existing_file(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        path.write_text("")
+        assert wait_for_file(str(path), timeout=0.1) is True
+
+    def test_file_created_while_waiting(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        timer = threading.Timer(0.1, path.write_text, args=("",))
+        timer.start()
+        try:
+            assert wait_for_file(str(path), timeout=2.0) is True
+        finally:
+            timer.cancel()
+
+    def test_timeout(self, tmp_path):
+        assert wait_for_file(str(tmp_path / "never.jsonl"), timeout=0.2) is False
+
+    def test_missing_parent_dir(self):
+        assert wait_for_file("/no/such/dir/file.jsonl", timeout=0.2) is False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestWaitWithInotify:
+    def test_file_created(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        timer = threading.Timer(0.1, path.write_text, args=("",))
+        timer.start()
+        try:
+            assert _wait_with_inotify(str(path), timeout=2.0) is True
+        finally:
+            timer.cancel()
+
+    def test_file_renamed_into_place(self, tmp_path):
+        path = tmp_path / "transcript.jsonl"
+        staging = tmp_path / "staging.tmp"
+        staging.write_text("")
+        timer = threading.Timer(0.1, os.replace, args=(staging, path))
+        timer.start()
+        try:
+            assert _wait_with_inotify(str(path), timeout=2.0) is True
+        finally:
+            timer.cancel()
+
+    def test_ignores_other_files(self, tmp_path):
+        timer = threading.Timer(0.05, (tmp_path / "other.jsonl").write_text, args=("",))
+        timer.start()
+        try:
+            assert _wait_with_inotify(str(tmp_path / "never.jsonl"), timeout=0.3) is False
+        finally:
+            timer.cancel()
+
+    def test_missing_parent_dir(self):
+        assert _wait_with_inotify("/no/such/dir/file.jsonl", timeout=0.2) is None
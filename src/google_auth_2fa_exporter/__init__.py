@@ -3,9 +3,37 @@
 This package can be used both as a CLI tool and as an importable library.
 """
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 
-from google_auth_2fa_exporter.decoder import OtpAccount, decode_uri
-from google_auth_2fa_exporter.extractor import extract_accounts
+if TYPE_CHECKING:
+    from google_auth_2fa_exporter.decoder import OtpAccount, decode_uri, decode_uris
+    from google_auth_2fa_exporter.extractor import extract_accounts
+
+# Library exports are imported on first access (PEP 562), so the CLI's
+# --version/--help paths do not pay for loading protobuf
+_LAZY_EXPORTS: dict[str, str] = {
+    "OtpAccount": "google_auth_2fa_exporter.decoder",
+    "decode_uri": "google_auth_2fa_exporter.decoder",
+    "decode_uris": "google_auth_2fa_exporter.decoder",
+    "extract_accounts": "google_auth_2fa_exporter.extractor",
+}
+
+__all__ = ["OtpAccount", "__version__", "decode_uri", "decode_uris", "extract_accounts"]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["OtpAccount", "__version__", "decode_uri", "extract_accounts"]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,27 +1,37 @@
 """Command-line interface for google_auth_2fa_exporter."""
 
 import sys
+from collections.abc import Sequence
+from typing import TextIO
 
 from google_auth_2fa_exporter import __version__
 
 
-def main() -> int:
+def main(argv: Sequence[str] | None = None, *, stream: TextIO | None = None) -> int:
     """CLI entry point.
 
+    Args:
+        argv: Command-line arguments, excluding the program name
+            (defaults to ``sys.argv[1:]``)
+        stream: Where version and help text are written (defaults to stdout)
+
     Returns:
         Exit code (0 for success, non-zero for errors)
     """
-    if len(sys.argv) > 1 and sys.argv[1] in ("--version", "-v"):
-        print(f"google-auth-2fa-exporter version {__version__}")
+    args = sys.argv[1:] if argv is None else argv
+    out = sys.stdout if stream is None else stream
+
+    if args and args[0] in ("--version", "-v"):
+        print(f"google-auth-2fa-exporter version {__version__}", file=out)
         return 0
 
-    if len(sys.argv) > 1 and sys.argv[1] in ("--help", "-h"):
-        print("google-auth-2fa-exporter - Google Authenticator 2FA Exporter TUI")
-        print(f"Version: {__version__}")
-        print("\nUsage: google-auth-2fa-exporter [options]")
-        print("\nOptions:")
-        print("  --version, -v    Show version")
-        print("  --help, -h       Show this help message")
+    if args and args[0] in ("--help", "-h"):
+        print("google-auth-2fa-exporter - Google Authenticator 2FA Exporter TUI", file=out)
+        print(f"Version: {__version__}", file=out)
+        print("\nUsage: google-auth-2fa-exporter [options]", file=out)
+        print("\nOptions:", file=out)
+        print("  --version, -v    Show version", file=out)
+        print("  --help, -h       Show this help message", file=out)
         return 0
 
     from google_auth_2fa_exporter.ui import GoogleAuthApp
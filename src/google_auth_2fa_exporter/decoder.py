@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import base64
 import hashlib
+from collections.abc import Iterable
 from dataclasses import dataclass
 from urllib.parse import parse_qs, unquote, urlparse
 
@@ -30,6 +31,23 @@ OTP_TYPE_MAP: dict[int, str] = {
     MigrationPayload.TOTP: "totp",
 }
 
+
+def _enum_table[T](mapping: dict[int, T], default: T) -> tuple[T, ...]:
+    """Flatten an enum-value map into a tuple indexed by enum value."""
+    return tuple(mapping.get(value, default) for value in range(max(mapping) + 1))
+
+
+def _enum_lookup[T](table: tuple[T, ...], value: int, default: T) -> T:
+    """Look up an enum value in a table, using ``default`` for unknown values."""
+    return table[value] if 0 <= value < len(table) else default
+
+
+# Enum values are small non-negative ints, so indexing a tuple replaces a
+# dict lookup per account field
+_ALGORITHM_TABLE = _enum_table(ALGORITHM_MAP, "SHA1")
+_DIGIT_COUNT_TABLE = _enum_table(DIGIT_COUNT_MAP, 6)
+_OTP_TYPE_TABLE = _enum_table(OTP_TYPE_MAP, "totp")
+
 HASH_MAP: dict[str, type] = {
     "SHA1": hashlib.sha1,
     "SHA256": hashlib.sha256,
@@ -38,7 +56,7 @@ HASH_MAP: dict[str, type] = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OtpAccount:
     name: str
     issuer: str
@@ -49,36 +67,58 @@ class OtpAccount:
     counter: int
 
 
+def _find_query_param(uri: str, key: str) -> str:
+    """Return the raw (still percent-encoded) value of ``key`` in a URI query."""
+    query = uri.partition("?")[2].partition("#")[0]
+    prefix = key + "="
+    for pair in query.split("&"):
+        if pair.startswith(prefix):
+            return pair[len(prefix) :]
+    return ""
+
+
 def extract_base64_payload(uri: str) -> str:
     """Extract base64 payload from an otpauth-migration URI or raw base64."""
     uri = uri.strip()
     if uri.startswith("otpauth-migration://"):
-        parsed = urlparse(uri)
-        params = parse_qs(parsed.query)
-        data_list = params.get("data")
-        if not data_list:
+        # The URI carries a single known parameter, so pick it out directly
+        # rather than building a full urlparse/parse_qs result. Only %XX
+        # escapes are decoded: a literal '+' is base64, not a space.
+        data = _find_query_param(uri, "data")
+        if not data:
             raise ValueError("No 'data' parameter found in migration URI")
-        return unquote(data_list[0])
+        return unquote(data) if "%" in data else data
     return uri
 
 
-def decode_migration_payload(base64_data: str) -> list[OtpAccount]:
-    """Decode a base64-encoded MigrationPayload into OtpAccount objects."""
+def decode_migration_payload(
+    base64_data: str, payload: MigrationPayload | None = None
+) -> list[OtpAccount]:
+    """Decode a base64-encoded MigrationPayload into OtpAccount objects.
+
+    Pass ``payload`` to reuse one message object across calls; ParseFromString
+    clears it before parsing.
+    """
     raw = base64.b64decode(base64_data)
-    payload = MigrationPayload()
+    if payload is None:
+        payload = MigrationPayload()
     payload.ParseFromString(raw)
 
     accounts: list[OtpAccount] = []
     for otp in payload.otp_parameters:
-        secret_b32 = base64.b32encode(otp.secret).decode("ascii").rstrip("=")
+        # Unpadded base32 length is ceil(bits / 5); slicing the encoded bytes
+        # to it avoids an rstrip("=") copy of the decoded string
+        secret = otp.secret
+        unpadded_len = (len(secret) * 8 + 4) // 5
+        secret_b32 = base64.b32encode(secret)[:unpadded_len].decode("ascii")
         accounts.append(
             OtpAccount(
                 name=otp.name,
                 issuer=otp.issuer,
                 totp_secret=secret_b32,
-                algorithm=ALGORITHM_MAP.get(otp.algorithm, "SHA1"),
-                digits=DIGIT_COUNT_MAP.get(otp.digits, 6),
-                otp_type=OTP_TYPE_MAP.get(otp.type, "totp"),
+                algorithm=_enum_lookup(_ALGORITHM_TABLE, otp.algorithm, "SHA1"),
+                digits=_enum_lookup(_DIGIT_COUNT_TABLE, otp.digits, 6),
+                otp_type=_enum_lookup(_OTP_TYPE_TABLE, otp.type, "totp"),
                 counter=otp.counter,
             )
         )
@@ -115,10 +155,19 @@ def _parse_otpauth_uri(uri: str) -> OtpAccount:
     )
 
 
-def decode_uri(uri: str) -> list[OtpAccount]:
+def decode_uri(uri: str, payload: MigrationPayload | None = None) -> list[OtpAccount]:
     """Decode an otpauth-migration URI, standard otpauth URI, or raw base64 into OtpAccount objects."""
     uri = uri.strip()
     if uri.startswith("otpauth://totp/") or uri.startswith("otpauth://hotp/"):
         return [_parse_otpauth_uri(uri)]
     b64 = extract_base64_payload(uri)
-    return decode_migration_payload(b64)
+    return decode_migration_payload(b64, payload)
+
+
+def decode_uris(uris: Iterable[str]) -> list[OtpAccount]:
+    """Decode several URIs, sharing one MigrationPayload message between them."""
+    payload = MigrationPayload()
+    accounts: list[OtpAccount] = []
+    for uri in uris:
+        accounts.extend(decode_uri(uri, payload))
+    return accounts
@@ -4,37 +4,60 @@ from __future__ import annotations
 
 import csv
 import json
+import multiprocessing
+import os
 import re
-import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from urllib.parse import quote
 
 import qrcode
+from qrcode.image.pil import PilImage
 
 from google_auth_2fa_exporter.decoder import OtpAccount
 
+# Smallest QR export worth a process pool; below this, starting the workers
+# (each re-importing qrcode and PIL) costs more than rendering serially
+QR_PARALLEL_MIN_ACCOUNTS = 16
 
+# otpauth URIs are short and scanned once from a screen, so the lowest error
+# correction level is enough; it needs fewer modules and encodes faster than
+# qrcode's default (M). Smaller boxes mean fewer pixels to rasterize and
+# compress. The quiet-zone border stays at the spec's 4 modules.
+QR_ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_L
+QR_BOX_SIZE = 6
+
+# Write buffer for CSV exports, so large vaults are flushed in a few big
+# write() calls rather than one per default-sized (8 KiB) buffer
+CSV_BUFFER_SIZE = 1 << 20
+
+# Characters that are illegal in file paths on common filesystems
+_ILLEGAL_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+# Deliberately not memoized: a process-wide cache would keep every secret
+# and URI in memory long after the export that built them
 def _build_otpauth_uri(acct: OtpAccount) -> str:
     """Build a standard otpauth:// URI from an OtpAccount."""
     otp_type = acct.otp_type
     label = quote(f"{acct.issuer}:{acct.name}", safe=":")
-    params = {
-        "secret": acct.totp_secret,
-        "issuer": acct.issuer,
-        "algorithm": acct.algorithm,
-        "digits": str(acct.digits),
-    }
+    # digits/counter are ints and need no escaping; the strings may come
+    # from a user-supplied otpauth URI, so they are still quoted
+    query = (
+        f"secret={quote(acct.totp_secret)}&issuer={quote(acct.issuer)}"
+        f"&algorithm={quote(acct.algorithm)}&digits={acct.digits}"
+    )
     if otp_type == "hotp":
-        params["counter"] = str(acct.counter)
+        query += f"&counter={acct.counter}"
     if otp_type == "totp":
-        params["period"] = "30"
-    query = "&".join(f"{k}={quote(v)}" for k, v in params.items())
+        query += "&period=30"
     return f"otpauth://{otp_type}/{label}?{query}"
 
 
 def _sanitize_filename(name: str) -> str:
     """Strip characters that are illegal in file paths."""
-    return re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", name).strip(". ")
+    return _ILLEGAL_FILENAME_CHARS_RE.sub("_", name).strip(". ")
 
 
 def _display_name(acct: OtpAccount) -> str:
@@ -50,7 +73,7 @@ def export_bitwarden_csv(
     """Write accounts as a Bitwarden-importable CSV."""
     output_path.mkdir(parents=True, exist_ok=True)
     filepath = output_path / "bitwarden_export.csv"
-    with open(filepath, "w", newline="") as f:
+    with open(filepath, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(
             [
@@ -67,23 +90,22 @@ def export_bitwarden_csv(
                 "login_totp",
             ]
         )
-        for acct in accounts:
-            uri = _build_otpauth_uri(acct)
-            writer.writerow(
-                [
-                    "",
-                    "",
-                    "1",
-                    _display_name(acct),
-                    "",
-                    "",
-                    "",
-                    "",
-                    acct.name,
-                    "",
-                    uri,
-                ]
+        writer.writerows(
+            (
+                "",
+                "",
+                "1",
+                _display_name(acct),
+                "",
+                "",
+                "",
+                "",
+                acct.name,
+                "",
+                _build_otpauth_uri(acct),
             )
+            for acct in accounts
+        )
     return filepath
 
 
@@ -96,64 +118,131 @@ def export_apple_passwords_csv(
     """
     output_path.mkdir(parents=True, exist_ok=True)
     filepath = output_path / "apple_passwords_export.csv"
-    with open(filepath, "w", newline="") as f:
+    with open(filepath, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(
             ["Title", "URL", "Username", "Password", "Notes", "OTPAuth"]
         )
-        for acct in accounts:
-            uri = _build_otpauth_uri(acct)
-            writer.writerow(
-                [_display_name(acct), "", acct.name, "", "", uri]
-            )
+        writer.writerows(
+            (_display_name(acct), "", acct.name, "", "", _build_otpauth_uri(acct))
+            for acct in accounts
+        )
     return filepath
 
 
+def _uuid4_strs(count: int) -> list[str]:
+    """Return ``count`` random (version 4) UUID strings.
+
+    Equivalent to ``str(uuid.uuid4())`` per item, but the entropy for the
+    whole batch comes from one os.urandom() call, and the version/variant
+    bits are set on the raw bytes, so no UUID objects are built.
+    """
+    raw = bytearray(os.urandom(16 * count))
+    raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])
+    raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])
+    hexed = raw.hex()
+    return [
+        f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+        for h in (hexed[i : i + 32] for i in range(0, len(hexed), 32))
+    ]
+
+
+def _aegis_entry(acct: OtpAccount, entry_uuid: str) -> dict:
+    """Build one Aegis vault entry for an account."""
+    info = {
+        "secret": acct.totp_secret,
+        "algo": acct.algorithm,
+        "digits": acct.digits,
+        "period": 30,
+    }
+    if acct.otp_type == "hotp":
+        info["counter"] = acct.counter
+    return {
+        "type": acct.otp_type,
+        "uuid": entry_uuid,
+        "name": acct.name,
+        "issuer": acct.issuer,
+        "info": info,
+    }
+
+
 def export_aegis_json(
     accounts: list[OtpAccount], output_path: Path
 ) -> Path:
     """Write accounts as an Aegis-format unencrypted JSON vault."""
     output_path.mkdir(parents=True, exist_ok=True)
     filepath = output_path / "aegis_export.json"
-    entries = []
-    for acct in accounts:
-        entry = {
-            "type": acct.otp_type,
-            "uuid": str(uuid.uuid4()),
-            "name": acct.name,
-            "issuer": acct.issuer,
-            "info": {
-                "secret": acct.totp_secret,
-                "algo": acct.algorithm,
-                "digits": acct.digits,
-                "period": 30,
-            },
-        }
-        if acct.otp_type == "hotp":
-            entry["info"]["counter"] = acct.counter
-        entries.append(entry)
-
+    entries = [
+        _aegis_entry(acct, entry_uuid)
+        for acct, entry_uuid in zip(accounts, _uuid4_strs(len(accounts)), strict=True)
+    ]
     vault = {
         "version": 2,
         "header": {"slots": None, "params": None},
         "db": {"version": 3, "entries": entries},
     }
+    # The vault is for machine import, so it is written compactly
     with open(filepath, "w") as f:
-        json.dump(vault, f, indent=2)
+        json.dump(vault, f, separators=(",", ":"))
     return filepath
 
 
+def _render_qr(
+    uri: str,
+    filepath: str,
+    error_correction: int = QR_ERROR_CORRECTION,
+    box_size: int = QR_BOX_SIZE,
+) -> None:
+    """Render one QR code PNG; module-level so process pool workers can run it."""
+    # Pinned to the Pillow writer so a missing PIL fails loudly instead of
+    # quietly falling back to qrcode's much slower pure-Python PNG backend
+    qr = qrcode.QRCode(
+        error_correction=error_correction, box_size=box_size, image_factory=PilImage
+    )
+    qr.add_data(uri)
+    qr.make(fit=True)
+    qr.make_image().save(filepath)
+
+
 def export_qr_codes(
-    accounts: list[OtpAccount], output_path: Path
+    accounts: list[OtpAccount],
+    output_path: Path,
+    error_correction: int = QR_ERROR_CORRECTION,
+    box_size: int = QR_BOX_SIZE,
 ) -> list[Path]:
-    """Generate individual QR code PNG images for each account."""
+    """Generate individual QR code PNG images for each account.
+
+    Rendering is CPU-bound pure Python, so batches of at least
+    QR_PARALLEL_MIN_ACCOUNTS are spread over a process pool.
+
+    Args:
+        accounts: Accounts to export
+        output_path: Directory to write the PNG files into
+        error_correction: One of the qrcode.constants.ERROR_CORRECT_* levels
+        box_size: Pixels per QR module
+    """
     output_path.mkdir(parents=True, exist_ok=True)
     paths: list[Path] = []
+    # Accounts sharing a display name map to one file; as in a serial
+    # export, the last of them wins, and no two workers write the same path
+    tasks: dict[str, str] = {}
     for acct in accounts:
-        uri = _build_otpauth_uri(acct)
         safe_name = _sanitize_filename(_display_name(acct))
         filepath = output_path / f"{safe_name}.png"
-        img = qrcode.make(uri)
-        img.save(filepath)
+        tasks.pop(str(filepath), None)
+        tasks[str(filepath)] = _build_otpauth_uri(acct)
         paths.append(filepath)
+
+    workers = min(os.cpu_count() or 1, len(tasks))
+    if len(tasks) < QR_PARALLEL_MIN_ACCOUNTS or workers < 2:
+        for filepath, uri in tasks.items():
+            _render_qr(uri, filepath, error_correction, box_size)
+        return paths
+
+    # spawn rather than fork: callers such as the TUI are multi-threaded
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        render = partial(_render_qr, error_correction=error_correction, box_size=box_size)
+        list(pool.map(render, tasks.values(), tasks.keys(), chunksize=4))
     return paths
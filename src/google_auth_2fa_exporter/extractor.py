@@ -2,33 +2,120 @@
 
 from __future__ import annotations
 
+import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import zxingcpp
+from google.protobuf.message import DecodeError
 from PIL import Image
 
-from google_auth_2fa_exporter.decoder import OtpAccount, decode_uri
+from google_auth_2fa_exporter.decoder import (
+    OtpAccount,
+    decode_uris,
+    extract_base64_payload,
+)
+from google_auth_2fa_exporter.google_auth_pb2 import MigrationPayload
 
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp", ".tiff"}
 
+# Barcode payloads worth decoding; str.startswith checks the tuple in one call
+OTP_URI_PREFIXES = ("otpauth-migration://", "otpauth://")
 
-def scan_image(path: Path) -> list[str]:
-    """Read all barcodes from an image file and return URI strings."""
-    img = Image.open(path)
+# Upper bound on threads decoding images in scan_directory()
+SCAN_MAX_WORKERS = 8
+
+# Longest image side scanned on the first pass; larger images (e.g. phone
+# photos of printed codes) are downscaled to this before barcode detection,
+# and rescanned at full size unless that finds a complete export
+SCAN_MAX_SIDE = 1500
+
+
+def _read_otp_uris(img: Image.Image) -> list[str]:
+    """Return the otpauth/otpauth-migration URIs among an image's barcodes."""
     results = zxingcpp.read_barcodes(img)
-    return [r.text for r in results if r.text.startswith(("otpauth-migration://", "otpauth://"))]
+    return [r.text for r in results if r.text.startswith(OTP_URI_PREFIXES)]
+
+
+def _is_complete_export(uris: list[str]) -> bool:
+    """Whether ``uris`` are every QR code of their Google Authenticator export.
+
+    Migration payloads record their batch size and index, so a downscaled
+    scan can prove it found every code of an export. Anything it cannot
+    vouch for (standard otpauth URIs, payloads without batch info, missing
+    indices) counts as incomplete.
+    """
+    if not uris:
+        return False
+    batches: dict[int, tuple[int, set[int]]] = {}
+    payload = MigrationPayload()
+    for uri in uris:
+        if not uri.startswith("otpauth-migration://"):
+            return False
+        try:
+            payload.ParseFromString(base64.b64decode(extract_base64_payload(uri)))
+        except (ValueError, DecodeError):
+            return False
+        if payload.batch_size < 1:
+            return False
+        size, seen = batches.setdefault(payload.batch_id, (payload.batch_size, set()))
+        if payload.batch_size != size:
+            return False
+        seen.add(payload.batch_index)
+    return all(seen == set(range(size)) for size, seen in batches.values())
+
+
+def scan_image(path: Path, max_side: int | None = SCAN_MAX_SIDE) -> list[str]:
+    """Read all barcodes from an image file and return URI strings.
+
+    Barcode detection cost grows with pixel count, so images whose longest
+    side exceeds ``max_side`` are scanned downscaled first (for JPEGs PIL
+    also decodes at reduced scale). Downscaling can make small codes on a
+    multi-code sheet unreadable, so unless that pass found a complete
+    Google Authenticator export the image is rescanned at full size and the
+    results merged. Pass ``max_side=None`` to always scan full size.
+    """
+    with Image.open(path) as img:
+        if max_side is None or max(img.size) <= max_side:
+            return _read_otp_uris(img)
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        uris = _read_otp_uris(img)
+    if _is_complete_export(uris):
+        return uris
+    with Image.open(path) as img:
+        return list(dict.fromkeys(_read_otp_uris(img) + uris))
 
 
 def scan_directory(directory: Path) -> list[str]:
-    """Scan all image files in a directory for migration URIs, deduplicated."""
+    """Scan all image files in a directory for migration URIs, deduplicated.
+
+    Images are decoded on a thread pool: PIL's decoders and zxing-cpp both
+    release the GIL, so files overlap. Results keep sorted filename order.
+    """
+    # DirEntry.is_file() answers from the directory listing where it can,
+    # so only the image-suffixed names may cost a stat()
+    with os.scandir(directory) as it:
+        image_paths = [
+            Path(entry.path)
+            for entry in sorted(it, key=lambda entry: entry.name)
+            if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+            and entry.is_file()
+        ]
+    if len(image_paths) > 1:
+        workers = min(SCAN_MAX_WORKERS, len(image_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(scan_image, image_paths))
+    else:
+        results = [scan_image(path) for path in image_paths]
+
     uris: list[str] = []
     seen: set[str] = set()
-    for path in sorted(directory.iterdir()):
-        if path.suffix.lower() in IMAGE_EXTENSIONS and path.is_file():
-            for uri in scan_image(path):
-                if uri not in seen:
-                    seen.add(uri)
-                    uris.append(uri)
+    for image_uris in results:
+        for uri in image_uris:
+            if uri not in seen:
+                seen.add(uri)
+                uris.append(uri)
     return uris
 
 
@@ -43,10 +130,9 @@ def extract_accounts(path: Path) -> list[OtpAccount]:
 
     accounts: list[OtpAccount] = []
     seen: set[tuple[str, str]] = set()
-    for uri in uris:
-        for acct in decode_uri(uri):
-            key = (acct.issuer, acct.name)
-            if key not in seen:
-                seen.add(key)
-                accounts.append(acct)
+    for acct in decode_uris(uris):
+        key = (acct.issuer, acct.name)
+        if key not in seen:
+            seen.add(key)
+            accounts.append(acct)
     return accounts
@@ -10,6 +10,7 @@ from typing import ClassVar
 import pyotp
 import pyperclip
 from rich.text import Text
+from textual import work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
@@ -34,9 +35,24 @@ from google_auth_2fa_exporter.exporter import (
 )
 from google_auth_2fa_exporter.extractor import IMAGE_EXTENSIONS, extract_accounts
 
+# Accounts table columns as (label, key)
+_COLUMNS = (
+    ("Issuer", "issuer"),
+    ("Account", "account"),
+    ("Secret", "secret"),
+    ("Code", "code"),
+)
+
 # Padding added to the widest value in each column
 _COL_PAD = 2
 
+# TOTP time step in seconds (exported accounts always use the default)
+_TOTP_PERIOD = 30
+
+# Countdown bar segments, sliced to length each tick
+_BAR_FULL = "\u2588" * _TOTP_PERIOD
+_BAR_EMPTY = "\u2591" * _TOTP_PERIOD
+
 
 # ---------------------------------------------------------------------------
 # File picker modal (images + directories)
@@ -49,11 +65,10 @@ class _ImageDirectoryTree(DirectoryTree):
     ALLOW_SELECT = True
 
     def filter_paths(self, paths: Iterable[Path]) -> Iterable[Path]:
-        return [
-            p
-            for p in paths
-            if p.is_dir() or p.suffix.lower() in IMAGE_EXTENSIONS
-        ]
+        # DirectoryTree sorts the result, so a generator is enough. The
+        # suffix test runs first so image files need no is_dir() stat.
+        exts = IMAGE_EXTENSIONS
+        return (p for p in paths if p.suffix.lower() in exts or p.is_dir())
 
 
 class FilePickerScreen(ModalScreen[Path | None]):
@@ -156,7 +171,7 @@ class _DirectoryOnlyTree(DirectoryTree):
     ALLOW_SELECT = True
 
     def filter_paths(self, paths: Iterable[Path]) -> Iterable[Path]:
-        return [p for p in paths if p.is_dir()]
+        return (p for p in paths if p.is_dir())
 
 
 class DirPickerScreen(ModalScreen[Path | None]):
@@ -306,31 +321,47 @@ class GoogleAuthApp(App[None]):
     def __init__(self) -> None:
         super().__init__()
         self._accounts: list[OtpAccount] = []
+        # TOTP time step the displayed codes belong to; codes only change
+        # when it does, so per-second refreshes in between skip regeneration
+        self._code_window: int | None = None
+        # pyotp generator per loaded account (None if it cannot be built),
+        # so refreshes do not reconstruct one per account per tick
+        self._otps: dict[OtpAccount, pyotp.OTP | None] = {}
+        # Code cell per table row; refreshes rewrite these in place instead
+        # of allocating a new Text for every account each window
+        self._code_texts: dict[str, Text] = {}
 
     def compose(self) -> ComposeResult:
         yield Header()
+        # Widgets the app reads or updates are kept as attributes, so the
+        # handlers (and the per-second refresh) need no DOM queries
+        self._file_input = Input(
+            placeholder="/path/to/qr-code.png or directory",
+            id="file-input",
+        )
+        self._uri_input = Input(
+            placeholder="otpauth-migration://offline?data=\u2026",
+            id="uri-input",
+        )
+        self._timer_bar = Static("", id="timer-bar")
+        self._table = DataTable(id="accounts-table")
+        self._export_dir_input = Input(
+            placeholder="Export directory (required)",
+            id="export-dir",
+        )
         with Horizontal(id="file-row"):
             yield Static("File/Dir:", classes="input-label")
-            yield Input(
-                placeholder="/path/to/qr-code.png or directory",
-                id="file-input",
-            )
+            yield self._file_input
             yield Button("Browse\u2026", id="browse-btn")
             yield Button("Load", id="load-btn", variant="primary")
         with Horizontal(id="uri-row"):
             yield Static("URI:", classes="input-label")
-            yield Input(
-                placeholder="otpauth-migration://offline?data=\u2026",
-                id="uri-input",
-            )
+            yield self._uri_input
             yield Button("Load", id="load-uri-btn", variant="primary")
-        yield Static("", id="timer-bar")
-        yield DataTable(id="accounts-table")
+        yield self._timer_bar
+        yield self._table
         with Horizontal(id="export-row"):
-            yield Input(
-                placeholder="Export directory (required)",
-                id="export-dir",
-            )
+            yield self._export_dir_input
             yield Button("Browse\u2026", id="browse-export-btn")
             yield Button("Apple CSV", id="btn-apple")
             yield Button("Bitwarden", id="btn-bitwarden")
@@ -339,84 +370,76 @@ class GoogleAuthApp(App[None]):
         yield Footer()
 
     def on_mount(self) -> None:
-        table = self.query_one("#accounts-table", DataTable)
-        table.add_columns(
-            ("Issuer", "issuer"),
-            ("Account", "account"),
-            ("Secret", "secret"),
-            ("Code", "code"),
-        )
+        table = self._table
+        table.add_columns(*_COLUMNS)
         table.cursor_type = "cell"
         self.set_interval(1.0, self._refresh_codes)
         self._refresh_timer()
 
     def _get_export_dir(self) -> Path | None:
-        raw = self.query_one("#export-dir", Input).value.strip()
+        raw = self._export_dir_input.value.strip()
         if not raw:
             return None
         return Path(raw).resolve()
 
+    @staticmethod
+    def _current_window() -> int:
+        return int(time.time() // _TOTP_PERIOD)
+
     def _seconds_remaining(self) -> int:
-        return 30 - int(time.time() % 30)
+        return _TOTP_PERIOD - int(time.time() % _TOTP_PERIOD)
 
     def _timer_display(self) -> str:
         remaining = self._seconds_remaining()
-        filled = remaining
-        empty = 30 - filled
-        return (
-            " TOTP "
-            + "\u2588" * filled
-            + "\u2591" * empty
-            + f" {remaining:2d}s"
-        )
+        empty = _TOTP_PERIOD - remaining
+        return f" TOTP {_BAR_FULL[:remaining]}{_BAR_EMPTY[:empty]} {remaining:2d}s"
 
     def _refresh_timer(self) -> None:
-        self.query_one("#timer-bar", Static).update(self._timer_display())
-
-    def _auto_size_columns(self) -> None:
-        """Resize each column to fit the widest value plus padding."""
-        table = self.query_one("#accounts-table", DataTable)
-        col_keys = ["issuer", "account", "secret", "code"]
-        col_labels = ["Issuer", "Account", "Secret", "Code"]
-        for col_key, label in zip(col_keys, col_labels, strict=True):
-            max_w = len(label)
-            for row_key_obj in table.rows:
-                try:
-                    val = table.get_cell(row_key_obj, col_key)
-                    val_str = val.plain if isinstance(val, Text) else str(val)
-                    max_w = max(max_w, len(val_str))
-                except Exception:
-                    pass
-            col_obj = table.columns.get(col_key)
-            if col_obj is not None:
-                col_obj.width = max_w + _COL_PAD
+        self._timer_bar.update(self._timer_display())
 
     def _populate_table(self) -> None:
-        table = self.query_one("#accounts-table", DataTable)
+        table = self._table
         table.clear()
+        self._code_window = self._current_window()
+        self._otps = {}
+        self._code_texts = {}
+        # Column widths fit the widest value plus padding; they are tracked
+        # while adding rows rather than by reading every cell back afterwards
+        widths = [len(label) for label, _ in _COLUMNS]
         for acct in self._accounts:
-            code_text = Text(self._generate_code(acct), style="bold cyan")
+            code = self._generate_code(acct)
+            row = (acct.issuer, acct.name, acct.totp_secret, code)
+            widths = [max(w, len(v)) for w, v in zip(widths, row, strict=True)]
+            row_key = f"{acct.issuer}:{acct.name}"
+            code_text = self._code_texts[row_key] = Text(code, style="bold cyan")
             table.add_row(
-                acct.issuer,
-                acct.name,
-                acct.totp_secret,
-                code_text,
-                key=f"{acct.issuer}:{acct.name}",
+                acct.issuer, acct.name, acct.totp_secret, code_text, key=row_key
             )
-        self._auto_size_columns()
+        for (_, col_key), width in zip(_COLUMNS, widths, strict=True):
+            col_obj = table.columns.get(col_key)
+            if col_obj is not None:
+                col_obj.width = width + _COL_PAD
+
+    @staticmethod
+    def _build_otp(acct: OtpAccount) -> pyotp.OTP | None:
+        digest = HASH_MAP.get(acct.algorithm, HASH_MAP["SHA1"])
+        otp_cls = pyotp.HOTP if acct.otp_type == "hotp" else pyotp.TOTP
+        try:
+            return otp_cls(acct.totp_secret, digest=digest, digits=acct.digits)
+        except Exception:
+            return None
 
     def _generate_code(self, acct: OtpAccount) -> str:
+        if acct in self._otps:
+            otp = self._otps[acct]
+        else:
+            otp = self._otps[acct] = self._build_otp(acct)
+        if otp is None:
+            return "------"
         try:
-            digest = HASH_MAP.get(acct.algorithm, HASH_MAP["SHA1"])
-            if acct.otp_type == "hotp":
-                hotp = pyotp.HOTP(
-                    acct.totp_secret, digest=digest, digits=acct.digits
-                )
-                return hotp.at(acct.counter)
-            totp = pyotp.TOTP(
-                acct.totp_secret, digest=digest, digits=acct.digits
-            )
-            return totp.now()
+            if isinstance(otp, pyotp.HOTP):
+                return otp.at(acct.counter)
+            return otp.now()
         except Exception:
             return "------"
 
@@ -424,11 +447,22 @@ class GoogleAuthApp(App[None]):
         self._refresh_timer()
         if not self._accounts:
             return
-        table = self.query_one("#accounts-table", DataTable)
+        window = self._current_window()
+        if window == self._code_window:
+            return
+        self._code_window = window
+        table = self._table
+        code_texts = self._code_texts
         for acct in self._accounts:
-            code = self._generate_code(acct)
-            code_text = Text(code, style="bold cyan")
+            if acct.otp_type == "hotp":
+                # Counter-based codes only change when the counter does
+                continue
             row_key = f"{acct.issuer}:{acct.name}"
+            code_text = code_texts.get(row_key)
+            if code_text is None:
+                continue
+            code_text.plain = self._generate_code(acct)
+            # Re-setting the same cell bumps the table's render cache
             try:
                 table.update_cell(row_key, "code", code_text)
             except Exception:
@@ -454,7 +488,7 @@ class GoogleAuthApp(App[None]):
         self._open_file_picker()
 
     def _open_file_picker(self) -> None:
-        current = self.query_one("#file-input", Input).value.strip()
+        current = self._file_input.value.strip()
         start = Path(current) if current else Path.home()
         if start.is_file():
             start = start.parent
@@ -467,10 +501,10 @@ class GoogleAuthApp(App[None]):
 
     def _on_file_picked(self, path: Path | None) -> None:
         if path is not None:
-            self.query_one("#file-input", Input).value = str(path)
+            self._file_input.value = str(path)
 
     def _open_export_picker(self) -> None:
-        current = self.query_one("#export-dir", Input).value.strip()
+        current = self._export_dir_input.value.strip()
         start = (
             Path(current)
             if current and Path(current).is_dir()
@@ -483,7 +517,7 @@ class GoogleAuthApp(App[None]):
 
     def _on_export_dir_picked(self, path: Path | None) -> None:
         if path is not None:
-            self.query_one("#export-dir", Input).value = str(path)
+            self._export_dir_input.value = str(path)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         btn = event.button.id
@@ -505,8 +539,8 @@ class GoogleAuthApp(App[None]):
             self._do_export("qr")
 
     def _do_load(self) -> None:
-        file_input = self.query_one("#file-input", Input).value.strip()
-        uri_input = self.query_one("#uri-input", Input).value.strip()
+        file_input = self._file_input.value.strip()
+        uri_input = self._uri_input.value.strip()
 
         try:
             if uri_input:
@@ -527,7 +561,17 @@ class GoogleAuthApp(App[None]):
         except Exception as e:
             self.notify(f"Error: {e}", severity="error")
 
+    def _export_in_progress(self) -> bool:
+        return any(
+            w.group == "export" and not w.is_finished for w in self.workers
+        )
+
     def _do_export(self, fmt: str) -> None:
+        # Exports write fixed file names, so a second one started while the
+        # first is still writing would clobber its files
+        if self._export_in_progress():
+            self.notify("An export is already running.", severity="warning")
+            return
         if not self._accounts:
             self.notify("No accounts loaded.", severity="warning")
             return
@@ -538,23 +582,31 @@ class GoogleAuthApp(App[None]):
                 severity="warning",
             )
             return
+        self._run_export(fmt, self._accounts, export_dir)
+
+    @work(thread=True, group="export")
+    def _run_export(
+        self, fmt: str, accounts: list[OtpAccount], export_dir: Path
+    ) -> None:
+        """Write an export off the UI thread, so code refreshes keep running."""
         try:
             if fmt == "apple":
-                path = export_apple_passwords_csv(
-                    self._accounts, export_dir
-                )
-                self.notify(f"Exported to {path}", severity="information")
+                path = export_apple_passwords_csv(accounts, export_dir)
+                message = f"Exported to {path}"
             elif fmt == "bitwarden":
-                path = export_bitwarden_csv(self._accounts, export_dir)
-                self.notify(f"Exported to {path}", severity="information")
+                path = export_bitwarden_csv(accounts, export_dir)
+                message = f"Exported to {path}"
             elif fmt == "aegis":
-                path = export_aegis_json(self._accounts, export_dir)
-                self.notify(f"Exported to {path}", severity="information")
+                path = export_aegis_json(accounts, export_dir)
+                message = f"Exported to {path}"
             elif fmt == "qr":
-                paths = export_qr_codes(self._accounts, export_dir)
-                self.notify(
-                    f"Exported {len(paths)} QR code(s) to {export_dir}",
-                    severity="information",
-                )
+                paths = export_qr_codes(accounts, export_dir)
+                message = f"Exported {len(paths)} QR code(s) to {export_dir}"
+            else:
+                return
         except Exception as e:
-            self.notify(f"Export error: {e}", severity="error")
+            self.call_from_thread(
+                self.notify, f"Export error: {e}", severity="error"
+            )
+            return
+        self.call_from_thread(self.notify, message, severity="information")
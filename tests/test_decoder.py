@@ -3,29 +3,40 @@
 from __future__ import annotations
 
 import base64
+from functools import lru_cache
 
 import pytest
 
 from google_auth_2fa_exporter.decoder import (
     decode_migration_payload,
     decode_uri,
+    decode_uris,
     extract_base64_payload,
 )
 from google_auth_2fa_exporter.google_auth_pb2 import MigrationPayload
 
+_OTP_DEFAULTS = {
+    "secret": b"TESTSECRET",
+    "name": "user@example.com",
+    "issuer": "ExampleIssuer",
+    "algorithm": MigrationPayload.SHA1,
+    "digits": MigrationPayload.SIX,
+    "type": MigrationPayload.TOTP,
+    "counter": 0,
+}
+
 
 def _make_payload(*otp_params: dict) -> str:
     """Build a base64-encoded MigrationPayload from dicts of OtpParameters fields."""
+    return _cached_payload(tuple(tuple(sorted(p.items())) for p in otp_params))
+
+
+@lru_cache(maxsize=None)
+def _cached_payload(otp_params: tuple[tuple[tuple[str, object], ...], ...]) -> str:
+    # Payloads are deterministic per input, so each one is serialized once
     payload = MigrationPayload()
-    for params in otp_params:
-        otp = payload.otp_parameters.add()
-        otp.secret = params.get("secret", b"TESTSECRET")
-        otp.name = params.get("name", "user@example.com")
-        otp.issuer = params.get("issuer", "ExampleIssuer")
-        otp.algorithm = params.get("algorithm", MigrationPayload.SHA1)
-        otp.digits = params.get("digits", MigrationPayload.SIX)
-        otp.type = params.get("type", MigrationPayload.TOTP)
-        otp.counter = params.get("counter", 0)
+    for items in otp_params:
+        payload.otp_parameters.add(**{**_OTP_DEFAULTS, **dict(items)})
     return base64.b64encode(payload.SerializeToString()).decode()
 
 
@@ -45,6 +56,18 @@ class TestExtractBase64Payload:
         with pytest.raises(ValueError, match="No 'data' parameter"):
             extract_base64_payload("otpauth-migration://offline?foo=bar")
 
+    def test_percent_encoded_data(self) -> None:
+        uri = "otpauth-migration://offline?data=ab%2Bc%2Fd%3D"
+        assert extract_base64_payload(uri) == "ab+c/d="
+
+    def test_literal_plus_kept(self) -> None:
+        uri = "otpauth-migration://offline?data=ab+c"
+        assert extract_base64_payload(uri) == "ab+c"
+
+    def test_data_among_other_params(self) -> None:
+        uri = "otpauth-migration://offline?foo=bar&data=SGVsbG8%3D&x=1#frag"
+        assert extract_base64_payload(uri) == "SGVsbG8="
+
 
 class TestDecodeMigrationPayload:
     def test_single_account(self) -> None:
@@ -61,6 +84,10 @@ class TestDecodeMigrationPayload:
         # Verify the secret is valid base32
         assert len(acct.totp_secret) > 0
 
+    def test_accounts_are_slotted(self) -> None:
+        (acct,) = decode_migration_payload(_make_payload({}))
+        assert not hasattr(acct, "__dict__")
+
     def test_multiple_accounts(self) -> None:
         b64 = _make_payload(
             {"name": "a@test.com", "issuer": "Svc1"},
@@ -71,28 +98,40 @@ class TestDecodeMigrationPayload:
         assert accounts[0].name == "a@test.com"
         assert accounts[1].name == "b@test.com"
 
-    def test_sha256_algorithm(self) -> None:
-        b64 = _make_payload({"algorithm": MigrationPayload.SHA256})
-        accounts = decode_migration_payload(b64)
-        assert accounts[0].algorithm == "SHA256"
-
-    def test_eight_digits(self) -> None:
-        b64 = _make_payload({"digits": MigrationPayload.EIGHT})
-        accounts = decode_migration_payload(b64)
-        assert accounts[0].digits == 8
-
-    def test_hotp_type(self) -> None:
-        b64 = _make_payload({"type": MigrationPayload.HOTP, "counter": 42})
-        accounts = decode_migration_payload(b64)
-        assert accounts[0].otp_type == "hotp"
-        assert accounts[0].counter == 42
-
-    def test_unspecified_defaults(self) -> None:
-        b64 = _make_payload({
-            "algorithm": MigrationPayload.ALGORITHM_UNSPECIFIED,
-            "digits": MigrationPayload.DIGIT_COUNT_UNSPECIFIED,
-            "type": MigrationPayload.OTP_TYPE_UNSPECIFIED,
-        })
+    @pytest.mark.parametrize(
+        ("override", "expected"),
+        [
+            ({"algorithm": MigrationPayload.SHA256}, {"algorithm": "SHA256"}),
+            ({"digits": MigrationPayload.EIGHT}, {"digits": 8}),
+            (
+                {"type": MigrationPayload.HOTP, "counter": 42},
+                {"otp_type": "hotp", "counter": 42},
+            ),
+            (
+                {
+                    "algorithm": MigrationPayload.ALGORITHM_UNSPECIFIED,
+                    "digits": MigrationPayload.DIGIT_COUNT_UNSPECIFIED,
+                    "type": MigrationPayload.OTP_TYPE_UNSPECIFIED,
+                },
+                {"algorithm": "SHA1", "digits": 6, "otp_type": "totp"},
+            ),
+        ],
+        ids=["sha256", "eight_digits", "hotp", "unspecified_defaults"],
+    )
+    def test_field_mapping(self, override: dict, expected: dict) -> None:
+        (account,) = decode_migration_payload(_make_payload(override))
+        for field, value in expected.items():
+            assert getattr(account, field) == value
+
+    @pytest.mark.parametrize("length", range(1, 11))
+    def test_secret_base32_unpadded(self, length: int) -> None:
+        secret = bytes(range(length))
+        accounts = decode_migration_payload(_make_payload({"secret": secret}))
+        expected = base64.b32encode(secret).decode("ascii").rstrip("=")
+        assert accounts[0].totp_secret == expected
+
+    def test_unknown_enum_values_use_defaults(self) -> None:
+        b64 = _make_payload({"algorithm": 99, "digits": 99, "type": 99})
         accounts = decode_migration_payload(b64)
         assert accounts[0].algorithm == "SHA1"
         assert accounts[0].digits == 6
@@ -183,3 +222,24 @@ class TestDecodeUri:
         acct = accounts[0]
         assert acct.issuer == ""
         assert acct.name == "user@example.com"
+
+
+class TestDecodeUris:
+    def test_accounts_from_each_uri_in_order(self) -> None:
+        first = _make_payload({"name": "alice"}, {"name": "bob"})
+        second = _make_payload({"name": "carol"})
+        accounts = decode_uris([
+            f"otpauth-migration://offline?data={first}",
+            "otpauth://totp/Example:dave?secret=JBSWY3DPEHPK3PXP",
+            second,
+        ])
+        assert [a.name for a in accounts] == ["alice", "bob", "dave", "carol"]
+
+    def test_reused_payload_does_not_leak_accounts(self) -> None:
+        payload = MigrationPayload()
+        decode_migration_payload(_make_payload({"name": "alice"}, {"name": "bob"}), payload)
+        accounts = decode_migration_payload(_make_payload({"name": "carol"}), payload)
+        assert [a.name for a in accounts] == ["carol"]
+
+    def test_empty(self) -> None:
+        assert decode_uris([]) == []
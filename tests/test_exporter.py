@@ -4,17 +4,25 @@ from __future__ import annotations
 
 import csv
 import json
+import uuid
+from dataclasses import replace
 from pathlib import Path
 
+import pytest
+import qrcode
+from PIL import Image
+
 from google_auth_2fa_exporter.decoder import OtpAccount
 from google_auth_2fa_exporter.exporter import (
     _build_otpauth_uri,
     _sanitize_filename,
+    _uuid4_strs,
     export_aegis_json,
     export_apple_passwords_csv,
     export_bitwarden_csv,
     export_qr_codes,
 )
+from google_auth_2fa_exporter.extractor import scan_image
 
 SAMPLE_ACCOUNTS = [
     OtpAccount(
@@ -63,6 +71,13 @@ class TestBuildOtpauthUri:
         assert "counter=5" in uri
         assert "period" not in uri
 
+    def test_exact_uri(self) -> None:
+        acct = replace(SAMPLE_ACCOUNTS[0], issuer="Acme Co", name="a b")
+        assert _build_otpauth_uri(acct) == (
+            "otpauth://totp/Acme%20Co:a%20b?secret=JBSWY3DPEHPK3PXP"
+            "&issuer=Acme%20Co&algorithm=SHA1&digits=6&period=30"
+        )
+
 
 class TestSanitizeFilename:
     def test_strips_illegal_chars(self) -> None:
@@ -129,8 +144,7 @@ class TestExportAegisJson:
     def test_writes_json(self, tmp_path: Path) -> None:
         path = export_aegis_json(SAMPLE_ACCOUNTS, tmp_path)
         assert path.exists()
-        with open(path) as f:
-            data = json.load(f)
+        data = json.loads(path.read_bytes())
         assert data["version"] == 2
         entries = data["db"]["entries"]
         assert len(entries) == 2
@@ -138,6 +152,34 @@ class TestExportAegisJson:
         assert entries[0]["info"]["secret"] == "JBSWY3DPEHPK3PXP"
         assert entries[1]["info"]["algo"] == "SHA256"
 
+    def test_unique_v4_uuids(self, tmp_path: Path) -> None:
+        path = export_aegis_json(SAMPLE_ACCOUNTS * 3, tmp_path)
+        uuids = [uuid.UUID(e["uuid"]) for e in json.loads(path.read_bytes())["db"]["entries"]]
+        assert len(set(uuids)) == 6
+        assert all(u.version == 4 for u in uuids)
+
+    def test_hotp_counter(self, tmp_path: Path) -> None:
+        acct = replace(SAMPLE_ACCOUNTS[0], otp_type="hotp", counter=7)
+        path = export_aegis_json([acct], tmp_path)
+        entry = json.loads(path.read_bytes())["db"]["entries"][0]
+        assert entry["type"] == "hotp"
+        assert entry["info"]["counter"] == 7
+        assert "counter" not in json.loads(
+            export_aegis_json(SAMPLE_ACCOUNTS[:1], tmp_path).read_bytes()
+        )["db"]["entries"][0]["info"]
+
+
+class TestUuid4Strs:
+    def test_valid_random_uuids(self) -> None:
+        strs = _uuid4_strs(50)
+        parsed = [uuid.UUID(s) for s in strs]
+        assert [str(u) for u in parsed] == strs
+        assert all(u.version == 4 and u.variant == uuid.RFC_4122 for u in parsed)
+        assert len(set(strs)) == 50
+
+    def test_empty(self) -> None:
+        assert _uuid4_strs(0) == []
+
 
 class TestExportQrCodes:
     def test_generates_images(self, tmp_path: Path) -> None:
@@ -150,3 +192,34 @@ class TestExportQrCodes:
     def test_filename_format(self, tmp_path: Path) -> None:
         paths = export_qr_codes(SAMPLE_ACCOUNTS[:1], tmp_path)
         assert paths[0].stem == "GitHub (alice@example.com)"
+
+    def test_images_scan_back_to_uri(self, tmp_path: Path) -> None:
+        paths = export_qr_codes(SAMPLE_ACCOUNTS[:1], tmp_path)
+        assert scan_image(paths[0]) == [_build_otpauth_uri(SAMPLE_ACCOUNTS[0])]
+
+    def test_custom_qr_settings(self, tmp_path: Path) -> None:
+        small = export_qr_codes(SAMPLE_ACCOUNTS[:1], tmp_path / "small", box_size=2)
+        large = export_qr_codes(
+            SAMPLE_ACCOUNTS[:1],
+            tmp_path / "large",
+            error_correction=qrcode.constants.ERROR_CORRECT_H,
+            box_size=8,
+        )
+        with Image.open(small[0]) as a, Image.open(large[0]) as b:
+            assert a.size[0] < b.size[0]
+
+    def test_duplicate_names_share_one_file(self, tmp_path: Path) -> None:
+        paths = export_qr_codes([SAMPLE_ACCOUNTS[0], SAMPLE_ACCOUNTS[0]], tmp_path)
+        assert paths[0] == paths[1]
+        assert list(tmp_path.iterdir()) == [paths[0]]
+
+    def test_parallel_export(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("google_auth_2fa_exporter.exporter.os.cpu_count", lambda: 2)
+        monkeypatch.setattr("google_auth_2fa_exporter.exporter.QR_PARALLEL_MIN_ACCOUNTS", 2)
+        accounts = [replace(SAMPLE_ACCOUNTS[0], name=f"user{i}") for i in range(5)]
+        paths = export_qr_codes(accounts, tmp_path)
+        assert [p.stem for p in paths] == [f"GitHub (user{i})" for i in range(5)]
+        for p in paths:
+            assert p.read_bytes().startswith(b"\x89PNG")
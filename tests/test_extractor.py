@@ -3,35 +3,67 @@
 from __future__ import annotations
 
 import base64
+import io
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
+import pytest
 import qrcode
+from PIL import Image
+from qrcode.image.pil import PilImage
 
-from google_auth_2fa_exporter.extractor import extract_accounts, scan_image
+from google_auth_2fa_exporter.extractor import (
+    SCAN_MAX_SIDE,
+    _is_complete_export,
+    _read_otp_uris,
+    extract_accounts,
+    scan_image,
+)
 from google_auth_2fa_exporter.google_auth_pb2 import MigrationPayload
 
 
-def _make_migration_uri(name: str = "user@test.com", issuer: str = "TestCo") -> str:
+@lru_cache(maxsize=None)
+def _make_migration_uri(
+    name: str = "user@test.com",
+    issuer: str = "TestCo",
+    batch_index: int = 0,
+    batch_size: int = 0,
+) -> str:
     """Create an otpauth-migration:// URI with one account."""
-    payload = MigrationPayload()
-    otp = payload.otp_parameters.add()
-    otp.secret = b"TESTSECRET12"
-    otp.name = name
-    otp.issuer = issuer
-    otp.algorithm = MigrationPayload.SHA1
-    otp.digits = MigrationPayload.SIX
-    otp.type = MigrationPayload.TOTP
+    payload = MigrationPayload(batch_index=batch_index, batch_size=batch_size, batch_id=7)
+    payload.otp_parameters.add(
+        secret=b"TESTSECRET12",
+        name=name,
+        issuer=issuer,
+        algorithm=MigrationPayload.SHA1,
+        digits=MigrationPayload.SIX,
+        type=MigrationPayload.TOTP,
+    )
     b64 = base64.b64encode(payload.SerializeToString()).decode()
     return f"otpauth-migration://offline?data={b64}"
 
 
 def _make_qr_image(uri: str, path: Path) -> Path:
     """Generate a QR code image file from a URI string."""
-    img = qrcode.make(uri)
-    img.save(path)
+    path.write_bytes(_qr_png(uri))
     return path
 
 
+@lru_cache(maxsize=None)
+def _qr_png(uri: str) -> bytes:
+    # Identical URIs give identical PNGs, so each is encoded once per session.
+    # One pixel per module is the smallest image zxing still decodes, keeping
+    # both the PNG encode and the scan cheap.
+    qr = qrcode.QRCode(box_size=1, border=1, image_factory=PilImage)
+    qr.add_data(uri)
+    qr.make(fit=True)
+    buf = io.BytesIO()
+    qr.make_image().save(buf)
+    return buf.getvalue()
+
+
 class TestScanImage:
     def test_round_trip(self, tmp_path: Path) -> None:
         uri = _make_migration_uri()
@@ -40,10 +72,15 @@ class TestScanImage:
         assert len(results) == 1
         assert results[0] == uri
 
-    def test_non_otpauth_qr_ignored(self, tmp_path: Path) -> None:
-        img_path = _make_qr_image("https://example.com", tmp_path / "url.png")
-        results = scan_image(img_path)
-        assert results == []
+    def test_non_otpauth_qr_ignored(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Only the prefix filter is under test, so the decoder is stubbed
+        uri = _make_migration_uri()
+        barcodes = [SimpleNamespace(text=t) for t in ("https://example.com", uri)]
+        monkeypatch.setattr(
+            "google_auth_2fa_exporter.extractor.zxingcpp.read_barcodes",
+            lambda img: barcodes,
+        )
+        assert _read_otp_uris(Image.new("L", (1, 1))) == [uri]
 
     def test_standard_otpauth_totp_qr(self, tmp_path: Path) -> None:
         uri = "otpauth://totp/GitHub:alice@github.com?secret=JBSWY3DPEHPK3PXP&issuer=GitHub"
@@ -53,6 +90,112 @@ class TestScanImage:
         assert results[0] == uri
 
 
+class TestIsCompleteExport:
+    def test_whole_batch(self) -> None:
+        uris = [_make_migration_uri(batch_index=i, batch_size=2) for i in (1, 0)]
+        assert _is_complete_export(uris)
+
+    def test_missing_index(self) -> None:
+        assert not _is_complete_export([_make_migration_uri(batch_size=2)])
+
+    def test_unverifiable(self) -> None:
+        assert not _is_complete_export([])
+        assert not _is_complete_export([_make_migration_uri()])
+        assert not _is_complete_export(
+            ["otpauth://totp/Svc:a?secret=JBSWY3DPEHPK3PXP"]
+        )
+
+
+class TestScanImageDownscale:
+    @staticmethod
+    def _qr(uri: str, box_size: int) -> Image.Image:
+        qr = qrcode.QRCode(box_size=box_size, image_factory=PilImage)
+        qr.add_data(uri)
+        qr.make(fit=True)
+        return qr.make_image().get_image().convert("L")
+
+    def _scan_sizes(self, img_path: Path) -> tuple[list[str], list[tuple[int, int]]]:
+        """Scan ``img_path``, recording the size of each image handed to zxing."""
+        sizes: list[tuple[int, int]] = []
+
+        def read(img: Image.Image) -> list[str]:
+            sizes.append(img.size)
+            return _read_otp_uris(img)
+
+        with patch("google_auth_2fa_exporter.extractor._read_otp_uris", read):
+            return scan_image(img_path), sizes
+
+    def test_complete_export_scanned_downscaled_only(self, tmp_path: Path) -> None:
+        uri = _make_migration_uri(batch_size=1)
+        img_path = tmp_path / "large.png"
+        qrcode.make(uri, box_size=40, image_factory=PilImage).save(img_path)
+        with Image.open(img_path) as img:
+            assert max(img.size) > SCAN_MAX_SIDE
+        uris, sizes = self._scan_sizes(img_path)
+        assert uris == [uri]
+        assert len(sizes) == 1
+        assert max(sizes[0]) <= SCAN_MAX_SIDE
+
+    def test_unverifiable_result_rescanned_full_size(self, tmp_path: Path) -> None:
+        uri = _make_migration_uri()  # No batch info to prove completeness
+        img_path = tmp_path / "large.png"
+        qrcode.make(uri, box_size=40, image_factory=PilImage).save(img_path)
+        with Image.open(img_path) as img:
+            full_size = img.size
+        uris, sizes = self._scan_sizes(img_path)
+        assert uris == [uri]
+        assert max(sizes[0]) <= SCAN_MAX_SIDE
+        assert sizes[1] == full_size
+
+    def test_keeps_codes_lost_by_downscaling(self, tmp_path: Path) -> None:
+        big = _make_migration_uri(name="big", batch_index=0, batch_size=2)
+        small = _make_migration_uri(name="small", batch_index=1, batch_size=2)
+        sheet = Image.new("L", (4000, 2000), 255)
+        sheet.paste(self._qr(big, 40), (0, 0))
+        # Two pixels per module: readable at full size, not once downscaled
+        sheet.paste(self._qr(small, 2), (3000, 500))
+        img_path = tmp_path / "sheet.png"
+        sheet.save(img_path)
+        assert sorted(scan_image(img_path)) == sorted([big, small])
+
+    def test_falls_back_to_full_size(self, tmp_path: Path) -> None:
+        uri = _make_migration_uri()
+        img_path = _make_qr_image(uri, tmp_path / "code.png")
+        # A tiny downscale makes that pass unreadable; full size still reads
+        assert scan_image(img_path, max_side=20) == [uri]
+
+    def test_max_side_none_scans_full_size(self, tmp_path: Path) -> None:
+        uri = _make_migration_uri()
+        img_path = _make_qr_image(uri, tmp_path / "code.png")
+        with patch(
+            "google_auth_2fa_exporter.extractor._read_otp_uris", wraps=_read_otp_uris
+        ) as read:
+            assert scan_image(img_path, max_side=None) == [uri]
+        with Image.open(img_path) as img:
+            assert read.call_args.args[0].size == img.size
+
+
+@pytest.fixture
+def scanned(monkeypatch: pytest.MonkeyPatch) -> dict[Path, str]:
+    """Map image paths to the URI scan_image should report for them.
+
+    Lets the directory tests exercise extract_accounts without encoding and
+    decoding real QR images; TestScanImage covers that path.
+    """
+    uris: dict[Path, str] = {}
+
+    def fake_scan(path: Path, max_side: int | None = SCAN_MAX_SIDE) -> list[str]:
+        return [uris[path]]
+
+    monkeypatch.setattr("google_auth_2fa_exporter.extractor.scan_image", fake_scan)
+    return uris
+
+
+def _stub_image(scanned: dict[Path, str], uri: str, path: Path) -> None:
+    path.touch()
+    scanned[path] = uri
+
+
 class TestExtractAccounts:
     def test_single_file(self, tmp_path: Path) -> None:
         uri = _make_migration_uri(name="alice", issuer="GitHub")
@@ -62,21 +205,40 @@ class TestExtractAccounts:
         assert accounts[0].name == "alice"
         assert accounts[0].issuer == "GitHub"
 
-    def test_directory(self, tmp_path: Path) -> None:
+    def test_directory(self, tmp_path: Path, scanned: dict[Path, str]) -> None:
         uri1 = _make_migration_uri(name="a@test.com", issuer="Svc1")
         uri2 = _make_migration_uri(name="b@test.com", issuer="Svc2")
-        _make_qr_image(uri1, tmp_path / "img1.png")
-        _make_qr_image(uri2, tmp_path / "img2.png")
+        _stub_image(scanned, uri1, tmp_path / "img1.png")
+        _stub_image(scanned, uri2, tmp_path / "img2.png")
         accounts = extract_accounts(tmp_path)
         assert len(accounts) == 2
         names = {a.name for a in accounts}
         assert "a@test.com" in names
         assert "b@test.com" in names
 
-    def test_deduplication(self, tmp_path: Path) -> None:
+    def test_directory_keeps_filename_order(
+        self, tmp_path: Path, scanned: dict[Path, str]
+    ) -> None:
+        names = [f"user{i}@test.com" for i in range(6)]
+        for i, name in enumerate(names):
+            uri = _make_migration_uri(name=name)
+            _stub_image(scanned, uri, tmp_path / f"img{i}.png")
+        accounts = extract_accounts(tmp_path)
+        assert [a.name for a in accounts] == names
+
+    def test_directory_skips_non_images(
+        self, tmp_path: Path, scanned: dict[Path, str]
+    ) -> None:
+        _stub_image(scanned, _make_migration_uri(name="only"), tmp_path / "code.PNG")
+        (tmp_path / "folder.png").mkdir()
+        (tmp_path / "notes.txt").write_text("otpauth://totp/x")
+        accounts = extract_accounts(tmp_path)
+        assert [a.name for a in accounts] == ["only"]
+
+    def test_deduplication(self, tmp_path: Path, scanned: dict[Path, str]) -> None:
         uri = _make_migration_uri(name="same@test.com", issuer="Same")
-        _make_qr_image(uri, tmp_path / "dup1.png")
-        _make_qr_image(uri, tmp_path / "dup2.png")
+        _stub_image(scanned, uri, tmp_path / "dup1.png")
+        _stub_image(scanned, uri, tmp_path / "dup2.png")
         accounts = extract_accounts(tmp_path)
         assert len(accounts) == 1
 
@@ -89,11 +251,13 @@ class TestExtractAccounts:
         assert accounts[0].name == "alice@github.com"
         assert accounts[0].totp_secret == "JBSWY3DPEHPK3PXP"
 
-    def test_directory_mixed_migration_and_standard(self, tmp_path: Path) -> None:
+    def test_directory_mixed_migration_and_standard(
+        self, tmp_path: Path, scanned: dict[Path, str]
+    ) -> None:
         migration_uri = _make_migration_uri(name="a@test.com", issuer="Svc1")
         standard_uri = "otpauth://totp/Svc2:b@test.com?secret=JBSWY3DPEHPK3PXP&issuer=Svc2"
-        _make_qr_image(migration_uri, tmp_path / "img1.png")
-        _make_qr_image(standard_uri, tmp_path / "img2.png")
+        _stub_image(scanned, migration_uri, tmp_path / "img1.png")
+        _stub_image(scanned, standard_uri, tmp_path / "img2.png")
         accounts = extract_accounts(tmp_path)
         assert len(accounts) == 2
         names = {a.name for a in accounts}
@@ -101,7 +265,5 @@ class TestExtractAccounts:
         assert "b@test.com" in names
 
     def test_nonexistent_path(self, tmp_path: Path) -> None:
-        import pytest
-
         with pytest.raises(FileNotFoundError):
             extract_accounts(tmp_path / "nope.png")
@@ -1,5 +1,7 @@
 """Tests for the CLI and package exports."""
 
+import io
+import subprocess
 import sys
 
 import pytest
@@ -19,19 +21,43 @@ def test_exports() -> None:
     assert decode_uri is not None
 
 
-def test_cli_version(capsys: pytest.CaptureFixture[str]) -> None:
+def test_exports_are_lazy() -> None:
+    """Test that importing the package does not load the decoder or protobuf."""
+    code = (
+        "import sys, google_auth_2fa_exporter as pkg; "
+        "assert 'google_auth_2fa_exporter.decoder' not in sys.modules; "
+        "assert pkg.extract_accounts is not None; "
+        "assert 'google_auth_2fa_exporter.decoder' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_unknown_attribute() -> None:
+    """Test that unknown package attributes raise AttributeError."""
+    import google_auth_2fa_exporter
+
+    with pytest.raises(AttributeError):
+        _ = google_auth_2fa_exporter.does_not_exist
+
+
+def test_cli_version() -> None:
     """Test CLI version flag."""
-    sys.argv = ["google-auth-2fa-exporter", "--version"]
-    exit_code = main()
-    captured = capsys.readouterr()
-    assert exit_code == 0
-    assert "0.1.0" in captured.out
+    stream = io.StringIO()
+    assert main(["--version"], stream=stream) == 0
+    assert "0.1.0" in stream.getvalue()
 
 
-def test_cli_help(capsys: pytest.CaptureFixture[str]) -> None:
+def test_cli_help() -> None:
     """Test CLI help flag."""
-    sys.argv = ["google-auth-2fa-exporter", "--help"]
-    exit_code = main()
-    captured = capsys.readouterr()
-    assert exit_code == 0
-    assert "Usage" in captured.out
+    stream = io.StringIO()
+    assert main(["--help"], stream=stream) == 0
+    assert "Usage" in stream.getvalue()
+
+
+def test_cli_defaults_to_sys_argv_and_stdout(
+    capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the console script path reads sys.argv and prints to stdout."""
+    monkeypatch.setattr(sys, "argv", ["google-auth-2fa-exporter", "-v"])
+    assert main() == 0
+    assert "0.1.0" in capsys.readouterr().out
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import threading
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
-import qrcode
 
+from google_auth_2fa_exporter.decoder import OtpAccount
 from google_auth_2fa_exporter.google_auth_pb2 import MigrationPayload
 from google_auth_2fa_exporter.ui import (
     DirPickerScreen,
@@ -16,19 +20,22 @@ from google_auth_2fa_exporter.ui import (
 )
 
 
+@lru_cache(maxsize=None)
 def _make_migration_uri() -> str:
     payload = MigrationPayload()
-    otp = payload.otp_parameters.add()
-    otp.secret = b"TESTSECRET12"
-    otp.name = "testuser@example.com"
-    otp.issuer = "TestService"
-    otp.algorithm = MigrationPayload.SHA1
-    otp.digits = MigrationPayload.SIX
-    otp.type = MigrationPayload.TOTP
+    payload.otp_parameters.add(
+        secret=b"TESTSECRET12",
+        name="testuser@example.com",
+        issuer="TestService",
+        algorithm=MigrationPayload.SHA1,
+        digits=MigrationPayload.SIX,
+        type=MigrationPayload.TOTP,
+    )
     b64 = base64.b64encode(payload.SerializeToString()).decode()
     return f"otpauth-migration://offline?data={b64}"
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_app_starts() -> None:
     """Test that the app starts and has expected widgets."""
@@ -40,6 +47,7 @@ async def test_app_starts() -> None:
         assert app.query_one("#load-btn") is not None
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_load_from_uri() -> None:
     """Test loading accounts from a pasted URI."""
@@ -54,6 +62,160 @@ async def test_load_from_uri() -> None:
         assert app._accounts[0].issuer == "TestService"
 
 
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_codes_regenerated_only_on_new_window(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Per-second refreshes only regenerate codes when the TOTP window changes."""
+    app = GoogleAuthApp()
+    async with app.run_test() as pilot:
+        app.query_one("#uri-input").value = _make_migration_uri()
+        await pilot.click("#load-uri-btn")
+        await pilot.pause()
+
+        calls: list[str] = []
+        original = app._generate_code
+        monkeypatch.setattr(
+            app, "_generate_code", lambda acct: calls.append(acct.name) or original(acct)
+        )
+        window = 33_333_334
+        monkeypatch.setattr(app, "_current_window", lambda: window)
+        app._code_window = window
+        app._refresh_codes()
+        assert calls == []
+
+        window += 1
+        app._refresh_codes()
+        assert calls == ["testuser@example.com"]
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_refresh_skips_hotp_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Counter-based codes are not regenerated when the TOTP window changes."""
+    totp = OtpAccount(
+        name="totp@example.com",
+        issuer="Svc",
+        totp_secret="JBSWY3DPEHPK3PXP",
+        algorithm="SHA1",
+        digits=6,
+        otp_type="totp",
+        counter=0,
+    )
+    hotp = replace(totp, name="hotp@example.com", otp_type="hotp", counter=5)
+    app = GoogleAuthApp()
+    async with app.run_test():
+        window = 33_333_334
+        monkeypatch.setattr(app, "_current_window", lambda: window)
+        app._accounts = [totp, hotp]
+        app._populate_table()
+
+        calls: list[str] = []
+        original = app._generate_code
+        monkeypatch.setattr(
+            app, "_generate_code", lambda acct: calls.append(acct.name) or original(acct)
+        )
+        window += 1
+        app._refresh_codes()
+        assert calls == ["totp@example.com"]
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_otp_generators_built_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each account's pyotp generator is built once and reused by refreshes."""
+    app = GoogleAuthApp()
+    async with app.run_test() as pilot:
+        app.query_one("#uri-input").value = _make_migration_uri()
+        await pilot.click("#load-uri-btn")
+        await pilot.pause()
+        acct = app._accounts[0]
+        otp = app._otps[acct]
+        assert otp is not None
+
+        monkeypatch.setattr(
+            app, "_build_otp", lambda acct: pytest.fail("generator rebuilt")
+        )
+        assert app._generate_code(acct) == otp.now()
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_columns_sized_to_widest_value() -> None:
+    """Each column fits its widest value (or its label) plus padding."""
+    app = GoogleAuthApp()
+    async with app.run_test() as pilot:
+        app.query_one("#uri-input").value = _make_migration_uri()
+        await pilot.click("#load-uri-btn")
+        await pilot.pause()
+        acct = app._accounts[0]
+        table = app.query_one("#accounts-table")
+        assert table.columns["issuer"].width == len(acct.issuer) + 2
+        assert table.columns["account"].width == len(acct.name) + 2
+        assert table.columns["secret"].width == len(acct.totp_secret) + 2
+        assert table.columns["code"].width == len(app._generate_code(acct)) + 2
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_export_runs_in_worker(tmp_path: Path) -> None:
+    """Exports are written by a background worker and then reported."""
+    app = GoogleAuthApp()
+    async with app.run_test(size=(160, 40)) as pilot:
+        app.query_one("#uri-input").value = _make_migration_uri()
+        await pilot.click("#load-uri-btn")
+        await pilot.pause()
+        app.query_one("#export-dir").value = str(tmp_path)
+        app._do_export("aegis")
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert (tmp_path / "aegis_export.json").exists()
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_export_refused_while_one_is_running(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A second export is refused until the running one has finished."""
+    release = threading.Event()
+    calls: list[Path] = []
+
+    def slow_export(accounts: list, output_path: Path) -> Path:
+        calls.append(output_path)
+        release.wait(timeout=5)
+        return output_path / "aegis_export.json"
+
+    monkeypatch.setattr("google_auth_2fa_exporter.ui.export_aegis_json", slow_export)
+    app = GoogleAuthApp()
+    async with app.run_test(size=(160, 40)) as pilot:
+        app.query_one("#uri-input").value = _make_migration_uri()
+        await pilot.click("#load-uri-btn")
+        await pilot.pause()
+        app.query_one("#export-dir").value = str(tmp_path)
+        warnings: list[str] = []
+        original_notify = app.notify
+
+        def notify(message: str, **kwargs: object) -> None:
+            if kwargs.get("severity") == "warning":
+                warnings.append(message)
+            original_notify(message, **kwargs)
+
+        monkeypatch.setattr(app, "notify", notify)
+        app._do_export("aegis")
+        app._do_export("aegis")
+        assert warnings == ["An export is already running."]
+
+        release.set()
+        await app.workers.wait_for_complete()
+        assert len(calls) == 1
+        app._do_export("aegis")
+        await app.workers.wait_for_complete()
+        assert len(calls) == 2
+
+
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_load_empty_shows_warning() -> None:
     """Test that loading with no input shows a warning."""
@@ -64,6 +226,7 @@ async def test_load_empty_shows_warning() -> None:
         assert len(app._accounts) == 0
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_browse_btn_opens_file_picker(tmp_path: Path) -> None:
     """Clicking the Browse button opens the FilePickerScreen modal."""
@@ -74,12 +237,13 @@ async def test_browse_btn_opens_file_picker(tmp_path: Path) -> None:
         assert isinstance(app.screen, FilePickerScreen)
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_file_picker_select_populates_input(tmp_path: Path) -> None:
     """Selecting a file in the picker and clicking Select populates the file input."""
-    img = qrcode.make("otpauth://totp/Test:u@t.com?secret=JBSWY3DPEHPK3PXP&issuer=Test")
+    # The picker filters on the suffix alone, so an empty file is enough
     img_path = tmp_path / "test.png"
-    img.save(img_path)
+    img_path.touch()
 
     app = GoogleAuthApp()
     async with app.run_test(size=(120, 40)) as pilot:
@@ -94,9 +258,12 @@ async def test_file_picker_select_populates_input(tmp_path: Path) -> None:
 
         tree = screen.query_one("#picker-tree")
 
-        # Wait for tree to load
-        for _ in range(5):
-            await pilot.pause()
+        # Wait until the tree has loaded the directory's entries
+        async def tree_loaded() -> None:
+            while not any(hasattr(c.data, "path") for c in tree.root.children):
+                await pilot.pause()
+
+        await asyncio.wait_for(tree_loaded(), timeout=2.0)
 
         # Find the test.png node and select it
         file_node = None
@@ -121,6 +288,7 @@ async def test_file_picker_select_populates_input(tmp_path: Path) -> None:
         assert app.query_one("#file-input").value == str(img_path)
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_file_picker_cancel_leaves_input_empty() -> None:
     """Clicking Cancel in the file picker does not change the file input."""
@@ -137,6 +305,7 @@ async def test_file_picker_cancel_leaves_input_empty() -> None:
         assert app.query_one("#file-input").value == ""
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_browse_export_btn_opens_dir_picker() -> None:
     """Clicking the export Browse button opens the DirPickerScreen modal."""
@@ -145,3 +314,32 @@ async def test_browse_export_btn_opens_dir_picker() -> None:
         await pilot.click("#browse-export-btn")
         await pilot.pause()
         assert isinstance(app.screen, DirPickerScreen)
+
+
+def test_timer_display(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The countdown bar shows one full block per remaining second."""
+    app = GoogleAuthApp()
+    monkeypatch.setattr(app, "_seconds_remaining", lambda: 10)
+    display = app._timer_display()
+    assert display == " TOTP " + "\u2588" * 10 + "\u2591" * 20 + " 10s"
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_refresh_reuses_code_cells(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Window changes rewrite the existing code cell rather than replacing it."""
+    app = GoogleAuthApp()
+    async with app.run_test() as pilot:
+        app.query_one("#uri-input").value = _make_migration_uri()
+        await pilot.click("#load-uri-btn")
+        await pilot.pause()
+        acct = app._accounts[0]
+        row_key = f"{acct.issuer}:{acct.name}"
+        cell = app._table.get_cell(row_key, "code")
+        assert cell is app._code_texts[row_key]
+
+        monkeypatch.setattr(app, "_generate_code", lambda acct: "123456")
+        app._code_window = None
+        app._refresh_codes()
+        assert app._table.get_cell(row_key, "code") is cell
+        assert cell.plain == "123456"